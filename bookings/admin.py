@@ -1,3 +1,25 @@
 from django.contrib import admin
+from bookings.models import Campus, CampusSchedule, ClosureDate, EmailOutbox
 
-# Register your models here.
+
+@admin.register(CampusSchedule)
+class CampusScheduleAdmin(admin.ModelAdmin):
+    list_display = ('campus_id', 'day_type', 'weekday', 'start_time', 'end_time')
+    list_filter = ('campus_id', 'day_type')
+
+
+@admin.register(ClosureDate)
+class ClosureDateAdmin(admin.ModelAdmin):
+    list_display = ('closure_date', 'every_year', 'description')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('outbox_id', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_date')
+    list_filter = ('kind', 'status')
+
+
+@admin.register(Campus)
+class CampusAdmin(admin.ModelAdmin):
+    list_display = ('campus_id', 'name', 'email', 'notification_mode', 'digest_interval_minutes', 'digest_at_service_start', 'last_digest_at')
+    list_filter = ('notification_mode',)
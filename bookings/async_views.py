@@ -0,0 +1,228 @@
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from bookings.models import Campus
+from bookings.serializers import CampusSerializerList
+from bookings.views import BookingList
+import bookings.catalog as catalog
+import bookings.conditional as conditional
+import bookings.details as details
+import bookings.events as events
+import bookings.utils as utils
+
+# JSON con el mismo formato de JSONRenderer de DRF
+DRF_JSON = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def respuesta_json(datos, status=status.HTTP_200_OK):
+    """
+    Respuesta JSON con el mismo cuerpo que daría Response de DRF.
+
+    :param datos: Cuerpo de la respuesta.
+    :param status: Código HTTP (int).
+    :return: JsonResponse.
+    """
+    return JsonResponse(datos, status=status, safe=False, encoder=JSONEncoder, json_dumps_params=DRF_JSON)
+
+
+class ContenidoCerrable:
+    """
+    Contenido async de un StreamingHttpResponse con close(), que Django llama
+    al cerrar la respuesta. Un generador async no tiene close() y solo se
+    cierra si se cancela o cuando el event loop lo recolecta.
+    """
+
+    def __init__(self, generador, al_cerrar):
+        self.generador = generador
+        self.al_cerrar = al_cerrar
+
+    def __aiter__(self):
+        return self.generador
+
+    def close(self):
+        self.al_cerrar()
+
+
+class AsyncAPIView(View):
+    """
+    Vista async sin DRF (DRF no soporta vistas async). Como las vistas
+    síncronas, corre las authentication_classes de DRF antes de atender la
+    petición, y las excepciones de DRF se responden como lo hace su exception
+    handler, así los clientes reciben los mismos errores en ambas.
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+    def autenticar(self, request):
+        """
+        Autentica la petición como APIView.perform_authentication. Síncrono:
+        los autenticadores pueden consultar la base.
+
+        :raises AuthenticationFailed: Si las credenciales no son válidas, con
+            el encabezado WWW-Authenticate del primer autenticador (o 403 si no tiene).
+        """
+        drf_request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            drf_request.user
+        except (NotAuthenticated, AuthenticationFailed) as exc:
+            auth_header = drf_request.authenticators[0].authenticate_header(drf_request) if drf_request.authenticators else None
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+            raise
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await sync_to_async(self.autenticar)(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            datos = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = respuesta_json(datos, status=exc.status_code)
+            if getattr(exc, 'auth_header', None):
+                response['WWW-Authenticate'] = exc.auth_header
+            return response
+
+
+class AsyncCampusList(AsyncAPIView):
+
+    async def get(self, request):
+        catalogo = await catalog.aobtener_catalogo()
+        campus = list(catalogo['sedes'].values())
+        etag = catalogo['etag']
+        modified = max((sede.modification_date for sede in campus), default=None)
+        not_modified = conditional.respuesta_no_modificada(request, etag, modified)
+        if not_modified:
+            return not_modified
+
+        serializer = CampusSerializerList(campus, many=True)
+        response = respuesta_json({'success': True, 'message': 'Campus List', 'data': serializer.data})
+        return conditional.agregar_validadores(response, etag, modified)
+
+
+class AsyncBookingHourList(AsyncAPIView):
+
+    async def get(self, request):
+        data = request.GET
+        campus_id = data.get('campus_id')
+        booking_date = data.get('booking_date')
+        people_amount = data.get('people_amount')
+
+        if not campus_id or not booking_date:
+            raise ValidationError('Missing required fields')
+
+        campus = await catalog.aobtener_sede(campus_id)
+        if campus is None:
+            raise NotFound('Campus not found')
+
+        # Horarios y ocupación salen de sus caches; solo una carga pasa por la base
+        hours_list = await sync_to_async(utils.obtener_horarios_permitidos)(campus.campus_id, booking_date, people_amount)
+        hours_list = [utils.convert_to_am_pm(hour) for hour in hours_list]
+
+        return respuesta_json({'success': True, 'message': 'Hours List', 'data': hours_list})
+
+
+class AsyncBookingList(AsyncAPIView):
+    listing = BookingList()
+
+    async def get(self, request, campus_id):
+        params = self.listing.parse_params(request.GET)
+
+        if await catalog.aobtener_sede(campus_id) is None:
+            raise NotFound('Campus not found')
+
+        try:
+            data_version, data_modified = await Campus.objects.values_list('data_version', 'data_modified').aget(campus_id=campus_id)
+        except Campus.DoesNotExist:
+            raise NotFound('Campus not found')
+
+        etag, data_modified = self.listing.get_etag(campus_id, params, data_version, data_modified)
+        not_modified = conditional.respuesta_no_modificada(request, etag, data_modified)
+        if not_modified:
+            return not_modified
+
+        bookings = [booking async for booking in self.listing.get_page_queryset(campus_id, params)]
+        response = respuesta_json(self.listing.get_page_body(bookings, params['page_size']))
+        return conditional.agregar_validadores(response, etag, data_modified)
+
+
+class AsyncBookingById(AsyncAPIView):
+
+    async def get(self, request, booking_id):
+        if not booking_id:
+            raise ValidationError('Missing required fields')
+
+        booking = await details.aobtener_detalle_reserva(booking_id)
+        if booking is None:
+            raise NotFound('Booking not found')
+
+        return respuesta_json({'success': True, 'message': 'Booking Detail', 'data': booking})
+
+
+class AsyncBookingActivasByPerson(AsyncAPIView):
+
+    async def get(self, request, person_id):
+        if not person_id:
+            raise ValidationError('Missing required fields')
+
+        bookings = await details.alistar_activas_de_persona(person_id)
+        return respuesta_json({'success': True, 'message': 'Active Bookings List', 'data': bookings})
+
+
+class AvailabilityStream(AsyncAPIView):
+    """
+    Stream Server-Sent Events con los cambios de disponibilidad ('availability')
+    y del listado de reservas ('booking') de una sede, en una fecha o en todas.
+    Requiere ASGI: bajo WSGI cada cliente ocuparía un worker mientras esté
+    conectado, por eso ahí se responde 501.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return respuesta_json({'detail': 'The event stream requires ASGI'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        campus_id = request.GET.get('campus_id')
+        booking_date = request.GET.get('booking_date')
+
+        if not campus_id:
+            raise ValidationError('Missing required fields')
+
+        if booking_date:
+            try:
+                booking_date = datetime.strptime(booking_date, '%Y-%m-%d').date().isoformat()
+            except ValueError:
+                raise ValidationError('Invalid date format')
+
+        campus = await catalog.aobtener_sede(campus_id)
+        if campus is None:
+            raise NotFound('Campus not found')
+
+        # Suscrito desde ya: no se pierden los eventos entre la respuesta y la primera lectura
+        subscription = events.central.suscribir(campus.campus_id, booking_date or None)
+
+        async def stream():
+            try:
+                yield events.formatear({'event': 'ready', 'data': {'campus_id': campus.campus_id, 'booking_date': booking_date or None}})
+                while True:
+                    event = await subscription.siguiente(settings.SSE_HEARTBEAT_SECONDS)
+                    if event is None:
+                        # Comentario SSE para que proxies y clientes no cierren la conexión
+                        yield ': ping\n\n'
+                        continue
+                    yield events.formatear(event)
+                    if event is events.DESCARTADO:
+                        return
+            finally:
+                events.central.cancelar(subscription)
+
+        response = StreamingHttpResponse(ContenidoCerrable(stream(), lambda: events.central.cancelar(subscription)), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
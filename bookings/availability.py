@@ -0,0 +1,137 @@
+from collections import defaultdict
+from itertools import accumulate
+from django.conf import settings
+from django.db import transaction
+from bookings.cache import CacheLRU
+from bookings.models import SlotOccupancy
+from bookings.slots import MINUTOS_POR_SLOT, SLOTS_POR_DIA, slot_de_hora
+
+# Máximo de personas permitidas dentro de la ventana de ocupación de un horario
+CAPACIDAD_MAXIMA = 30
+
+# Minutos antes y después de un horario que cuentan para su ocupación
+VENTANA_MINUTOS = 89
+
+# Franjas completas dentro de la ventana a cada lado (89 minutos -> 5 franjas)
+VENTANA_SLOTS = VENTANA_MINUTOS // MINUTOS_POR_SLOT
+
+# Perfiles de ocupación por (sede, fecha); se invalidan al escribir reservas
+cache_ocupacion = CacheLRU(settings.AVAILABILITY_CACHE_MAX_ENTRIES, settings.AVAILABILITY_CACHE_TTL)
+
+
+class PerfilOcupacion:
+    """
+    Ocupación de una sede en una fecha, lista para consultar cualquier horario
+    sin volver a la base de datos.
+
+    Guarda la suma acumulada de personas por franja de 15 minutos, así la
+    ocupación de una ventana es una resta entre dos posiciones.
+    """
+
+    def __init__(self, reservas):
+        personas_por_slot = [0] * SLOTS_POR_DIA
+        for slot, personas in reservas:
+            personas_por_slot[slot] += personas
+        self.acumulado = [0] + list(accumulate(personas_por_slot))
+
+    def ocupacion(self, hora_reserva):
+        """
+        Suma las personas reservadas a menos de VENTANA_MINUTOS del horario.
+
+        :param hora_reserva: Hora a consultar (time o str, formato HH:MM).
+        :return: Personas ocupando la ventana (int).
+        """
+        slot = slot_de_hora(hora_reserva)
+        inicio = max(slot - VENTANA_SLOTS, 0)
+        fin = min(slot + VENTANA_SLOTS + 1, SLOTS_POR_DIA)
+        return self.acumulado[fin] - self.acumulado[inicio]
+
+    def admite(self, hora_reserva, cantidad_personas):
+        return self.ocupacion(hora_reserva) + cantidad_personas <= CAPACIDAD_MAXIMA
+
+
+def cargar_perfil_ocupacion(sede_id, fecha_reserva):
+    """
+    Carga en una sola consulta la ocupación por franja de la sede en la fecha
+    (a lo sumo una fila por franja, sin importar cuántas reservas tenga el día).
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    :return: PerfilOcupacion de la sede para esa fecha.
+    """
+    ocupaciones = SlotOccupancy.objects.filter(
+        campus_id=sede_id,
+        occupancy_date=fecha_reserva,
+    ).values_list('slot', 'people_total')
+
+    return PerfilOcupacion(ocupaciones)
+
+
+def clave_ocupacion(sede_id, fecha_reserva):
+    fecha = fecha_reserva if isinstance(fecha_reserva, str) else fecha_reserva.isoformat()
+    return (int(sede_id), fecha)
+
+
+def obtener_perfil_ocupacion(sede_id, fecha_reserva):
+    """
+    Devuelve el perfil de ocupación desde el cache o lo carga de la base de datos.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    :return: PerfilOcupacion de la sede para esa fecha.
+    """
+    clave = clave_ocupacion(sede_id, fecha_reserva)
+    perfil = cache_ocupacion.obtener(clave)
+    if perfil is None:
+        generacion = cache_ocupacion.generacion(clave)
+        perfil = cargar_perfil_ocupacion(sede_id, fecha_reserva)
+        cache_ocupacion.guardar(clave, perfil, generacion)
+    return perfil
+
+
+def obtener_perfiles_ocupacion(sede_id, fechas):
+    """
+    Devuelve el perfil de ocupación de varias fechas. Las que no están en cache
+    se cargan juntas con una sola consulta sobre el rango que las contiene.
+
+    :param sede_id: ID de la sede (int).
+    :param fechas: Fechas a consultar (lista de str, formato YYYY-MM-DD).
+    :return: Diccionario fecha -> PerfilOcupacion.
+    """
+    perfiles = {}
+    pendientes = {}
+    for fecha in fechas:
+        clave = clave_ocupacion(sede_id, fecha)
+        perfil = cache_ocupacion.obtener(clave)
+        if perfil is None:
+            pendientes[fecha] = cache_ocupacion.generacion(clave)
+        else:
+            perfiles[fecha] = perfil
+
+    if not pendientes:
+        return perfiles
+
+    ocupaciones = SlotOccupancy.objects.filter(
+        campus_id=sede_id,
+        occupancy_date__range=(min(pendientes), max(pendientes)),
+    ).values_list('occupancy_date', 'slot', 'people_total')
+
+    ocupaciones_por_fecha = defaultdict(list)
+    for fecha, slot, personas in ocupaciones:
+        ocupaciones_por_fecha[fecha.isoformat()].append((slot, personas))
+
+    for fecha, generacion in pendientes.items():
+        perfil = PerfilOcupacion(ocupaciones_por_fecha.get(fecha, []))
+        cache_ocupacion.guardar(clave_ocupacion(sede_id, fecha), perfil, generacion)
+        perfiles[fecha] = perfil
+
+    return perfiles
+
+
+def invalidar_ocupacion(sede_id, fecha_reserva):
+    """
+    Descarta el perfil cacheado de la sede y fecha cuando la transacción en
+    curso confirma la escritura de una reserva.
+    """
+    clave = clave_ocupacion(sede_id, fecha_reserva)
+    transaction.on_commit(lambda: cache_ocupacion.invalidar(clave))
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache en memoria del proceso con expiración por tiempo (TTL) y descarte
+    de la entrada usada hace más tiempo (LRU) cuando se llena.
+
+    Cada invalidación avanza un reloj y anota cuándo se invalidó la clave; un
+    valor calculado antes de una invalidación de su clave se descarta al
+    guardarlo, así una lectura lenta no deja en cache datos anteriores a una
+    escritura. Solo se recuerdan las últimas max_entradas invalidaciones: las
+    más antiguas suben un piso y una lectura iniciada antes del piso no se
+    guarda, aunque su clave no haya cambiado.
+    """
+
+    def __init__(self, max_entradas, ttl_segundos):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas = OrderedDict()
+        self._invalidadas = OrderedDict()  # Clave -> reloj de su última invalidación
+        self._reloj = 0
+        self._piso = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._entradas[clave]
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return entrada[1]
+
+    def generacion(self, clave):
+        """
+        Toma la generación antes de leer de la base el valor de la clave.
+
+        :param clave: Clave a leer.
+        :return: Generación para pasar a guardar (int).
+        """
+        with self._lock:
+            return self._reloj
+
+    def guardar(self, clave, valor, generacion=None):
+        with self._lock:
+            if generacion is not None and (generacion < self._piso or generacion < self._invalidadas.get(clave, 0)):
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.evictions += 1
+
+    def invalidar(self, clave):
+        with self._lock:
+            self._reloj += 1
+            self._invalidadas[clave] = self._reloj
+            self._invalidadas.move_to_end(clave)
+            while len(self._invalidadas) > self.max_entradas:
+                _, reloj = self._invalidadas.popitem(last=False)
+                self._piso = reloj
+            if self._entradas.pop(clave, None) is not None:
+                self.invalidations += 1
+
+    def limpiar(self):
+        with self._lock:
+            self._reloj += 1
+            self._piso = self._reloj
+            self._invalidadas.clear()
+            self._entradas.clear()
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                'entries': len(self._entradas),
+                'max_entries': self.max_entradas,
+                'ttl_seconds': self.ttl_segundos,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / consultas, 4) if consultas else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
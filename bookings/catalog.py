@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from bookings.models import Campus
+
+# Campos de la sede que se actualizan con update() sin pasar por save() y
+# que por eso el catálogo puede tener desactualizados: leerlos de la base
+CAMPOS_VOLATILES = ('data_version', 'data_modified', 'last_digest_at')
+
+_catalogo = None
+_cargado_en = 0.0
+_lock = threading.Lock()
+
+
+def cargar_catalogo():
+    """
+    Carga todas las sedes y calcula un ETag por sede y otro del catálogo a
+    partir de su contenido.
+
+    :return: Diccionario con 'sedes' (campus_id -> Campus, en orden de ID),
+        'etags' (campus_id -> str) y 'etag' (str).
+    """
+    sedes = {}
+    etags = {}
+    for campus in Campus.objects.defer(*CAMPOS_VOLATILES).order_by('campus_id'):
+        sedes[campus.campus_id] = campus
+        contenido = '|'.join(str(getattr(campus, campo.attname)) for campo in Campus._meta.concrete_fields if campo.attname not in CAMPOS_VOLATILES)
+        etags[campus.campus_id] = '"%s"' % hashlib.md5(contenido.encode()).hexdigest()
+
+    etag = '"%s"' % hashlib.md5(''.join(etags.values()).encode()).hexdigest()
+    return {'sedes': sedes, 'etags': etags, 'etag': etag}
+
+
+def obtener_catalogo():
+    """
+    Devuelve el catálogo de sedes, cargándolo si aún no existe en este proceso
+    o si superó CAMPUS_CATALOG_MAX_AGE (cambios hechos desde otro proceso).
+    """
+    global _catalogo, _cargado_en
+    with _lock:
+        if _catalogo is None or time.monotonic() - _cargado_en > settings.CAMPUS_CATALOG_MAX_AGE:
+            _catalogo = cargar_catalogo()
+            _cargado_en = time.monotonic()
+        return _catalogo
+
+
+async def aobtener_catalogo():
+    """
+    Versión async de obtener_catalogo: si el catálogo está vigente lo devuelve
+    sin salir del event loop y solo pasa a un hilo cuando hay que cargarlo.
+    """
+    catalogo = _catalogo
+    if catalogo is not None and time.monotonic() - _cargado_en <= settings.CAMPUS_CATALOG_MAX_AGE:
+        return catalogo
+    return await sync_to_async(obtener_catalogo)()
+
+
+def invalidar_catalogo(**kwargs):
+    global _catalogo
+    with _lock:
+        _catalogo = None
+
+
+def obtener_sede(sede_id):
+    """
+    Busca una sede en el catálogo. La instancia es compartida por todo el
+    proceso: no modificarla ni leer de ella CAMPOS_VOLATILES.
+
+    :param sede_id: ID de la sede (int o str).
+    :return: Sede (Campus) o None si no existe.
+    """
+    try:
+        return obtener_catalogo()['sedes'].get(int(sede_id))
+    except (TypeError, ValueError):
+        return None
+
+
+async def aobtener_sede(sede_id):
+    """
+    Versión async de obtener_sede.
+    """
+    try:
+        return (await aobtener_catalogo())['sedes'].get(int(sede_id))
+    except (TypeError, ValueError):
+        return None
+
+
+def listar_sedes():
+    """
+    :return: Sedes del catálogo en orden de ID (lista de Campus).
+    """
+    return list(obtener_catalogo()['sedes'].values())
+
+
+def etag_sede(sede_id):
+    """
+    :param sede_id: ID de la sede (int).
+    :return: ETag del contenido de la sede (str) o None si no existe.
+    """
+    return obtener_catalogo()['etags'].get(int(sede_id))
+
+
+def etag_catalogo():
+    """
+    :return: ETag del contenido de todas las sedes (str).
+    """
+    return obtener_catalogo()['etag']
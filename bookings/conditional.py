@@ -0,0 +1,72 @@
+import hashlib
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from bookings.models import Campus
+
+
+def registrar_cambio(sede_id):
+    """
+    Aumenta la versión de datos de una sede. Llamar dentro de la transacción
+    que crea, aprueba o cancela una reserva: así el ETag de sus listados cambia
+    justo cuando el cambio queda guardado.
+
+    :param sede_id: ID de la sede (int).
+    """
+    Campus.objects.filter(campus_id=sede_id).update(data_version=F('data_version') + 1, data_modified=timezone.now())
+
+
+def registrar_cambio_persona(instance, **kwargs):
+    """
+    Aumenta la versión de datos de las sedes donde la persona tiene reservas,
+    porque sus listados muestran el nombre y el teléfono de la persona.
+    Conectada a post_save y pre_delete de People.
+
+    :param instance: Persona guardada o por eliminar (People).
+    """
+    Campus.objects.filter(booking__person_id=instance.person_id).update(data_version=F('data_version') + 1, data_modified=timezone.now())
+
+
+def calcular_etag(*partes):
+    """
+    Calcula un ETag fuerte a partir de las partes que determinan la respuesta.
+
+    :param partes: Valores que identifican el contenido (versiones, filtros, etc.).
+    :return: ETag entre comillas (str).
+    """
+    return '"%s"' % hashlib.md5(':'.join(str(parte) for parte in partes).encode()).hexdigest()
+
+
+def respuesta_no_modificada(request, etag, modificado=None):
+    """
+    Devuelve un 304 si el cliente ya tiene la versión actual (If-None-Match o
+    If-Modified-Since), para responder sin consultar ni serializar los datos.
+
+    :param request: Petición.
+    :param etag: ETag de la versión actual (str).
+    :param modificado: Momento del último cambio (datetime) o None.
+    :return: Respuesta 304 (HttpResponseNotModified) o None si hay que generar la respuesta.
+    """
+    ultimo_cambio = int(modificado.timestamp()) if modificado else None
+    respuesta = get_conditional_response(request, etag=etag, last_modified=ultimo_cambio)
+    if respuesta is not None:
+        agregar_validadores(respuesta, etag, modificado)
+    return respuesta
+
+
+def agregar_validadores(response, etag, modificado=None):
+    """
+    Agrega ETag, Last-Modified y Cache-Control a una respuesta para que el
+    cliente revalide en cada consulta.
+
+    :param response: Respuesta.
+    :param etag: ETag de la versión (str).
+    :param modificado: Momento del último cambio (datetime) o None.
+    :return: La misma respuesta.
+    """
+    response['ETag'] = etag
+    if modificado:
+        response['Last-Modified'] = http_date(modificado.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import transaction
+from bookings.cache import CacheLRU
+from bookings.models import Booking
+from bookings.serializers import BookingByIdSerializer, BookingListSerializer
+
+# Detalle serializado por reserva; se invalida al aprobarla o cancelarla en
+# este proceso y en los demás vence a los BOOKING_CACHE_TTL segundos
+cache_reservas = CacheLRU(settings.BOOKING_CACHE_MAX_ENTRIES, settings.BOOKING_CACHE_TTL)
+
+
+def obtener_detalle_reserva(booking_id):
+    """
+    Obtiene el detalle de una reserva con su persona en una sola consulta, o
+    sin consultas si ya está en cache.
+
+    :param booking_id: ID de la reserva (int).
+    :return: Detalle serializado (dict) o None si la reserva no existe.
+    """
+    detalle = cache_reservas.obtener(booking_id)
+    if detalle is not None:
+        return detalle
+
+    generacion = cache_reservas.generacion(booking_id)
+    try:
+        booking = Booking.objects.select_related('person_id').get(booking_id=booking_id)
+    except Booking.DoesNotExist:
+        return None
+
+    detalle = BookingByIdSerializer(booking).data
+    cache_reservas.guardar(booking_id, detalle, generacion)
+    return detalle
+
+
+async def aobtener_detalle_reserva(booking_id):
+    """
+    Versión async de obtener_detalle_reserva, con el ORM async.
+    """
+    detalle = cache_reservas.obtener(booking_id)
+    if detalle is not None:
+        return detalle
+
+    generacion = cache_reservas.generacion(booking_id)
+    try:
+        booking = await Booking.objects.select_related('person_id').aget(booking_id=booking_id)
+    except Booking.DoesNotExist:
+        return None
+
+    detalle = BookingByIdSerializer(booking).data
+    cache_reservas.guardar(booking_id, detalle, generacion)
+    return detalle
+
+
+def reservas_activas_de_persona(person_id):
+    return (
+        Booking.objects
+        .filter(person_id=person_id, active=True)
+        .select_related('person_id')
+        .order_by('booking_date', 'booking_slot', 'booking_id')
+    )
+
+
+def listar_activas_de_persona(person_id):
+    """
+    Lista las reservas activas de una persona con una sola consulta.
+
+    :param person_id: ID de la persona (int).
+    :return: Reservas serializadas (lista de dict).
+    """
+    return BookingListSerializer(reservas_activas_de_persona(person_id), many=True).data
+
+
+async def alistar_activas_de_persona(person_id):
+    """
+    Versión async de listar_activas_de_persona, con el ORM async.
+    """
+    bookings = [booking async for booking in reservas_activas_de_persona(person_id)]
+    return BookingListSerializer(bookings, many=True).data
+
+
+def invalidar_reserva(booking_id):
+    """
+    Descarta el detalle cacheado de una reserva cuando la transacción en
+    curso confirma su cambio.
+
+    :param booking_id: ID de la reserva (int).
+    """
+    transaction.on_commit(lambda: cache_reservas.invalidar(booking_id))
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from bookings.models import Campus, CampusDigestEvent, EmailOutbox
+import bookings.schedules as schedules
+
+
+def nuevo_evento(booking_id, campus, estado_reserva, **datos):
+    """
+    Prepara, sin guardarlo, el evento de una reserva confirmada o cancelada
+    para el próximo resumen de la sede.
+
+    :param booking_id: ID de la reserva (int).
+    :param campus: Sede de la reserva (Campus).
+    :param estado_reserva: 'confirmada' o 'cancelada' (str).
+    :param datos: Datos de la reserva para el resumen; deben ser serializables a JSON.
+    :return: Evento sin guardar (CampusDigestEvent).
+    """
+    return CampusDigestEvent(booking_id_id=booking_id, campus_id=campus, booking_status=estado_reserva, payload=datos)
+
+
+def inicios_de_servicio(sede_id, fecha):
+    """
+    Obtiene los minutos del día en que empieza cada servicio (bloque continuo
+    de horarios) de una sede en una fecha.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha: Fecha (date).
+    :return: Lista de minutos del día (int).
+    """
+    minutos = schedules.minutos_de_atencion(sede_id, fecha.weekday(), schedules.tipo_de_dia(fecha))
+    abiertos = set(minutos)
+    return [minuto for minuto in minutos if minuto - schedules.INTERVALO_MINUTOS not in abiertos]
+
+
+def resumen_vencido(campus, primer_evento, ahora):
+    """
+    Indica si a la sede le corresponde un resumen: pasó su intervalo desde el
+    último resumen (o desde el primer evento pendiente, si nunca se envió uno)
+    o, si así está configurada, empezó un servicio desde el último resumen.
+
+    :param campus: Sede (Campus).
+    :param primer_evento: Fecha de creación del evento pendiente más antiguo (datetime).
+    :param ahora: Momento actual (datetime con zona horaria).
+    :return: True si hay que enviar el resumen, False en caso contrario.
+    """
+    referencia = campus.last_digest_at or primer_evento
+    if ahora - referencia >= timedelta(minutes=campus.digest_interval_minutes):
+        return True
+
+    if campus.digest_at_service_start and campus.last_digest_at:
+        local = timezone.localtime(ahora)
+        for minuto in inicios_de_servicio(campus.campus_id, local.date()):
+            inicio = timezone.make_aware(datetime.combine(local.date(), datetime.min.time()) + timedelta(minutes=minuto))
+            if campus.last_digest_at < inicio <= ahora:
+                return True
+
+    return False
+
+
+def enviar_resumen(campus_id, ahora=None):
+    """
+    Encola en la bandeja de salida un correo con las reservas acumuladas de la
+    sede y las marca como enviadas. La sede se bloquea para que dos procesos
+    no armen el mismo resumen.
+
+    :param campus_id: ID de la sede (int).
+    :param ahora: Momento del resumen (datetime con zona horaria); por defecto ahora.
+    :return: Número de reservas incluidas en el resumen (int).
+    """
+    ahora = ahora or timezone.now()
+    with transaction.atomic():
+        campus = Campus.objects.select_for_update().get(campus_id=campus_id)
+        eventos = list(
+            CampusDigestEvent.objects
+            .filter(campus_id=campus, digest_sent_at__isnull=True)
+            .order_by('creation_date', 'event_id')
+        )
+        if not eventos:
+            return 0
+
+        reservas = [{'estado_reserva': evento.booking_status, **evento.payload} for evento in eventos]
+        EmailOutbox.objects.create(
+            kind=EmailOutbox.CAMPUS_DIGEST,
+            payload={'correo_destinatario': campus.email, 'sede_reserva': campus.name, 'reservas': reservas},
+            next_attempt_at=timezone.now(),
+        )
+        CampusDigestEvent.objects.filter(event_id__in=[evento.event_id for evento in eventos]).update(digest_sent_at=ahora)
+        # update() no dispara post_save: el catálogo de sedes no se recarga por esto
+        Campus.objects.filter(campus_id=campus.campus_id).update(last_digest_at=ahora)
+
+    return len(eventos)
+
+
+def enviar_resumenes_vencidos(ahora=None, forzar=False):
+    """
+    Envía el resumen de cada sede en modo DIGEST que tenga reservas pendientes
+    y cuyo resumen esté vencido.
+
+    :param ahora: Momento actual (datetime con zona horaria); por defecto ahora.
+    :param forzar: Envía los resúmenes aunque no estén vencidos (bool).
+    :return: Diccionario campus_id -> reservas incluidas en su resumen.
+    """
+    ahora = ahora or timezone.now()
+    pendientes = dict(
+        CampusDigestEvent.objects
+        .filter(digest_sent_at__isnull=True)
+        .values_list('campus_id')
+        .annotate(primer_evento=Min('creation_date'))
+    )
+    enviados = {}
+    # Una sede que volvió al modo inmediato envía de una vez lo que tenía acumulado
+    for campus in Campus.objects.filter(campus_id__in=pendientes):
+        if forzar or campus.notification_mode == Campus.IMMEDIATE or resumen_vencido(campus, pendientes[campus.campus_id], ahora):
+            enviados[campus.campus_id] = enviar_resumen(campus.campus_id, ahora)
+    return enviados
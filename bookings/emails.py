@@ -0,0 +1,62 @@
+import threading
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.template import Context
+from django.template.loader import get_template
+
+# Cada tipo de correo extiende el diseño que se le pase: el HTML y el texto
+# plano salen de la misma plantilla, así no se duplican los textos
+LAYOUT_HTML = 'emails/layout.html'
+LAYOUT_TEXTO = 'emails/layout.txt'
+
+_plantillas = {}
+_lock = threading.Lock()
+
+
+def obtener_plantilla(nombre):
+    """
+    Devuelve una plantilla compilada. Cada plantilla se compila una sola vez
+    por proceso.
+
+    :param nombre: Ruta de la plantilla (str).
+    :return: Plantilla compilada (django.template.Template).
+    """
+    plantilla = _plantillas.get(nombre)
+    if plantilla is None:
+        with _lock:
+            plantilla = _plantillas.get(nombre)
+            if plantilla is None:
+                plantilla = get_template(nombre).template
+                _plantillas[nombre] = plantilla
+    return plantilla
+
+
+def renderizar_correo(tipo, contexto):
+    """
+    Renderiza un tipo de correo en HTML (con escape de los datos) y en texto plano.
+
+    :param tipo: Nombre de la plantilla del tipo en templates/emails, sin extensión (str).
+    :param contexto: Variables de la plantilla (dict): saludo, detalles (lista de
+        pares etiqueta, valor) y las propias del tipo.
+    :return: Tupla (texto, html) del cuerpo del correo.
+    """
+    plantilla = obtener_plantilla(f'emails/{tipo}.html')
+    html = plantilla.render(Context({**contexto, 'layout': obtener_plantilla(LAYOUT_HTML)}))
+    texto = plantilla.render(Context({**contexto, 'layout': obtener_plantilla(LAYOUT_TEXTO)}, autoescape=False))
+    return texto, html
+
+
+def construir_correo(tipo, asunto, correo_destinatario, contexto):
+    """
+    Construye un correo con cuerpo de texto plano y alternativa HTML.
+
+    :param tipo: Nombre de la plantilla del tipo en templates/emails (str).
+    :param asunto: Asunto del correo (str).
+    :param correo_destinatario: Correo del destinatario (str).
+    :param contexto: Variables de la plantilla (dict).
+    :return: Correo listo para enviar (EmailMultiAlternatives).
+    """
+    texto, html = renderizar_correo(tipo, contexto)
+    correo = EmailMultiAlternatives(asunto, texto, settings.EMAIL_HOST_USER, [correo_destinatario])
+    correo.attach_alternative(html, 'text/html')
+    return correo
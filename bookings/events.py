@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+from django.conf import settings
+from django.db import transaction
+
+# Evento final que recibe un suscriptor descartado por no leer a tiempo
+DESCARTADO = {'event': 'dropped', 'data': {'reason': 'slow consumer'}}
+
+
+class Suscripcion:
+    """
+    Cola de eventos de un cliente del stream, atada al event loop que la lee.
+    """
+
+    def __init__(self, sede_id, fecha, tamano_cola):
+        self.sede_id = sede_id
+        self.fecha = fecha
+        self.loop = asyncio.get_running_loop()
+        self.cola = asyncio.Queue(maxsize=tamano_cola)
+        self.descartada = False
+
+    async def siguiente(self, espera):
+        """
+        Espera el próximo evento.
+
+        :param espera: Segundos máximos de espera (float).
+        :return: Evento (dict) o None si no llegó ninguno a tiempo.
+        """
+        try:
+            return await asyncio.wait_for(self.cola.get(), espera)
+        except asyncio.TimeoutError:
+            return None
+
+
+class CentralEventos:
+    """
+    Pub/sub en memoria del proceso: las escrituras de reservas publican por
+    sede y fecha y cada cliente del stream recibe los eventos en su cola.
+
+    Una cola llena significa un cliente que no lee al ritmo de los eventos: se
+    vacía, recibe DESCARTADO y se da de baja, así un cliente lento no acumula
+    memoria ni frena a los demás.
+    """
+
+    def __init__(self, tamano_cola):
+        self.tamano_cola = tamano_cola
+        self._suscripciones = {}
+        self._lock = threading.Lock()
+        self.descartadas = 0
+
+    def suscribir(self, sede_id, fecha=None):
+        """
+        Crea una suscripción. Llamar desde el event loop que la va a leer.
+
+        :param sede_id: ID de la sede (int).
+        :param fecha: Fecha en formato YYYY-MM-DD (str); None para todas las fechas de la sede.
+        :return: Suscripcion.
+        """
+        suscripcion = Suscripcion(sede_id, fecha, self.tamano_cola)
+        with self._lock:
+            self._suscripciones.setdefault((sede_id, fecha), set()).add(suscripcion)
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        with self._lock:
+            suscripciones = self._suscripciones.get((suscripcion.sede_id, suscripcion.fecha))
+            if suscripciones is not None:
+                suscripciones.discard(suscripcion)
+                if not suscripciones:
+                    del self._suscripciones[(suscripcion.sede_id, suscripcion.fecha)]
+
+    def publicar(self, sede_id, fecha, evento):
+        """
+        Entrega un evento a los suscriptores de la sede y fecha y a los de
+        todas las fechas de la sede. Se puede llamar desde cualquier hilo.
+
+        :param sede_id: ID de la sede (int).
+        :param fecha: Fecha en formato YYYY-MM-DD (str).
+        :param evento: Evento (dict con 'event' y 'data').
+        :return: Suscriptores a los que se envió (int).
+        """
+        with self._lock:
+            destinos = list(self._suscripciones.get((sede_id, fecha), ())) + list(self._suscripciones.get((sede_id, None), ()))
+
+        for suscripcion in destinos:
+            try:
+                suscripcion.loop.call_soon_threadsafe(self._entregar, suscripcion, evento)
+            except RuntimeError:
+                # El loop del cliente ya se cerró
+                self.cancelar(suscripcion)
+        return len(destinos)
+
+    def _entregar(self, suscripcion, evento):
+        # Corre en el loop del suscriptor, el único que toca su cola
+        if suscripcion.descartada:
+            return
+        try:
+            suscripcion.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            suscripcion.descartada = True
+            self.descartadas += 1
+            self.cancelar(suscripcion)
+            while not suscripcion.cola.empty():
+                suscripcion.cola.get_nowait()
+            suscripcion.cola.put_nowait(DESCARTADO)
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                'subscribers': sum(len(suscripciones) for suscripciones in self._suscripciones.values()),
+                'topics': len(self._suscripciones),
+                'dropped': self.descartadas,
+            }
+
+
+central = CentralEventos(settings.SSE_QUEUE_SIZE)
+
+
+def notificar(sede_id, fecha, tipo, **datos):
+    """
+    Publica un cambio de la sede y fecha cuando la transacción en curso se
+    confirma; si se revierte, no se publica nada.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha: Fecha (date o str, formato YYYY-MM-DD).
+    :param tipo: 'availability' (cambió la ocupación) o 'booking' (cambió el listado) (str).
+    :param datos: Datos del evento; deben ser serializables a JSON.
+    """
+    fecha = fecha if isinstance(fecha, str) else fecha.isoformat()
+    evento = {'event': tipo, 'data': {'campus_id': int(sede_id), 'booking_date': fecha, **datos}}
+    transaction.on_commit(lambda: central.publicar(int(sede_id), fecha, evento))
+
+
+def formatear(evento):
+    """
+    Da formato de Server-Sent Events a un evento.
+
+    :param evento: Evento (dict con 'event' y 'data').
+    :return: Mensaje SSE (str).
+    """
+    return f"event: {evento['event']}\ndata: {json.dumps(evento['data'], separators=(',', ':'))}\n\n"
@@ -0,0 +1,128 @@
+import csv
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.utils import timezone
+from bookings.models import Booking
+
+# Filtro de cada estado, con las mismas reglas de BookingListSerializer.get_state
+FILTROS_ESTADO = {
+    'PENDIENTE': Q(active=True, approved=False),
+    'GESTIONADA': Q(active=False, approved=True),
+    'CANCELADA': Q(active=False, approved=False) | Q(active=True, approved=True),
+}
+
+COLUMNAS = [
+    'booking_id', 'campus_id', 'booking_date', 'booking_hour', 'people_amount', 'state',
+    'person_id', 'name_person', 'phone_person', 'email_person', 'observations', 'creation_date',
+]
+
+TAMANO_BLOQUE = 2000
+
+
+def estado_reserva(active, approved):
+    if approved and not active:
+        return 'GESTIONADA'
+    if active and not approved:
+        return 'PENDIENTE'
+    return 'CANCELADA'
+
+
+def filas_reservas(campus_id=None, fecha_desde=None, fecha_hasta=None, estado=None):
+    """
+    Recorre las reservas filtradas con un cursor del lado del servidor, de a
+    TAMANO_BLOQUE filas, sin cargar el resultado completo en memoria.
+
+    :param campus_id: ID de la sede (int); None para todas.
+    :param fecha_desde: Primera fecha (date); None sin límite.
+    :param fecha_hasta: Última fecha (date); None sin límite.
+    :param estado: PENDIENTE, GESTIONADA o CANCELADA (str); None para todos.
+    :return: Generador de filas (dict con las claves de COLUMNAS).
+    """
+    reservas = Booking.objects.all()
+    if campus_id is not None:
+        reservas = reservas.filter(campus_id=campus_id)
+    if fecha_desde:
+        reservas = reservas.filter(booking_date__gte=fecha_desde)
+    if fecha_hasta:
+        reservas = reservas.filter(booking_date__lte=fecha_hasta)
+    if estado:
+        reservas = reservas.filter(FILTROS_ESTADO[estado])
+
+    valores = reservas.order_by('booking_date', 'booking_slot', 'booking_hour', 'booking_id').values_list(
+        'booking_id', 'campus_id', 'booking_date', 'booking_hour', 'people_amount', 'active', 'approved',
+        'person_id', 'person_id__first_name', 'person_id__first_last_name', 'person_id__phone_number',
+        'person_id__email', 'observations', 'creation_date',
+    )
+    for (booking_id, sede, fecha, hora, personas, active, approved, person_id, nombre, apellido,
+         celular, correo, observaciones, creacion) in valores.iterator(chunk_size=TAMANO_BLOQUE):
+        yield {
+            'booking_id': booking_id,
+            'campus_id': sede,
+            'booking_date': fecha.isoformat(),
+            'booking_hour': hora.strftime('%H:%M'),
+            'people_amount': personas,
+            'state': estado_reserva(active, approved),
+            'person_id': person_id,
+            'name_person': f'{nombre} {apellido}',
+            'phone_person': celular,
+            'email_person': correo,
+            'observations': observaciones,
+            'creation_date': timezone.localtime(creacion).isoformat(),  # Hora local, como la API
+        }
+
+
+class _Eco:
+    # Destino de csv.writer que devuelve la línea en lugar de guardarla
+    def write(self, valor):
+        return valor
+
+
+def lineas_csv(filas):
+    """
+    Convierte las filas en líneas CSV, empezando por el encabezado.
+
+    :param filas: Filas (iterable de dict con las claves de COLUMNAS).
+    :return: Generador de líneas (str).
+    """
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(COLUMNAS)
+    for fila in filas:
+        yield escritor.writerow([fila[columna] for columna in COLUMNAS])
+
+
+def lineas_ndjson(filas):
+    """
+    Convierte las filas en líneas NDJSON (un objeto JSON por línea).
+
+    :param filas: Filas (iterable de dict).
+    :return: Generador de líneas (str).
+    """
+    for fila in filas:
+        yield json.dumps(fila, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+async def abloques(lineas):
+    """
+    Recorre un generador de líneas desde ASGI. Cada bloque de TAMANO_BLOQUE
+    líneas se lee con sync_to_async, en el mismo hilo (y la misma conexión y
+    cursor) que los anteriores, así el servidor envía cada bloque sin cargar
+    el resultado completo en memoria. Con un iterador síncrono, Django bajo
+    ASGI lee todas las líneas antes de enviar el primer byte.
+
+    :param lineas: Generador de líneas (str).
+    :return: Generador async de bloques (str).
+    """
+    siguiente_bloque = sync_to_async(lambda: ''.join(islice(lineas, TAMANO_BLOQUE)))
+    while True:
+        bloque = await siguiente_bloque()
+        if not bloque:
+            return
+        yield bloque
+
+
+FORMATOS = {
+    'csv': (lineas_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (lineas_ndjson, 'application/x-ndjson; charset=utf-8'),
+}
@@ -0,0 +1,121 @@
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from bookings.models import IdempotencyKey
+
+LONGITUD_MAXIMA = IdempotencyKey._meta.get_field('key').max_length
+
+
+def clave_de_peticion(request):
+    """
+    Lee el encabezado Idempotency-Key de una petición.
+
+    :param request: Petición.
+    :return: Clave (str) o None si la petición no la envía.
+    :raises ValidationError: Si la clave es más larga que LONGITUD_MAXIMA.
+    """
+    clave = request.headers.get('Idempotency-Key', '').strip()
+    if not clave:
+        return None
+    if len(clave) > LONGITUD_MAXIMA:
+        raise ValidationError('Invalid Idempotency-Key')
+    return clave
+
+
+def huella(datos):
+    """
+    Calcula la huella del cuerpo de una petición, para detectar una clave
+    reutilizada con otros datos.
+
+    :param datos: Cuerpo de la petición (dict o list).
+    :return: SHA-256 en hexadecimal (str).
+    """
+    return hashlib.sha256(json.dumps(datos, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def repetir(registro, huella_peticion):
+    """
+    Construye la respuesta guardada de una clave ya usada.
+
+    :param registro: Clave guardada (IdempotencyKey).
+    :param huella_peticion: Huella de la petición actual (str).
+    :return: Respuesta guardada (Response), marcada con Idempotent-Replayed.
+    :raises ValidationError: Si la clave se usó con otros datos.
+    """
+    if registro.request_hash != huella_peticion:
+        raise ValidationError('Idempotency-Key already used with a different request')
+    response = Response(registro.response_body, status=registro.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def respuesta_guardada(clave, endpoint, huella_peticion):
+    """
+    Busca la respuesta de una petición anterior con la misma clave, con una
+    sola consulta y antes de cualquier validación o bloqueo.
+
+    :param clave: Valor de Idempotency-Key (str).
+    :param endpoint: Nombre del endpoint (str).
+    :param huella_peticion: Huella de la petición actual (str).
+    :return: Respuesta guardada (Response) o None si la clave no se ha usado o venció.
+    :raises ValidationError: Si la clave se usó con otros datos.
+    """
+    registro = IdempotencyKey.objects.filter(key=clave, endpoint=endpoint, expires_at__gt=timezone.now()).first()
+    if registro is None:
+        return None
+    return repetir(registro, huella_peticion)
+
+
+def reclamar(clave, endpoint, huella_peticion):
+    """
+    Reserva la clave dentro de la transacción que atiende la petición. Si otra
+    petición con la misma clave está en curso, la inserción espera a que esa
+    transacción termine: si se confirmó, se devuelve su respuesta; si se
+    revirtió, esta petición se queda con la clave.
+
+    :param clave: Valor de Idempotency-Key (str).
+    :param endpoint: Nombre del endpoint (str).
+    :param huella_peticion: Huella de la petición actual (str).
+    :return: Respuesta guardada (Response) o None si la clave quedó reservada para esta petición.
+    :raises ValidationError: Si la clave se usó con otros datos.
+    """
+    ahora = timezone.now()
+    IdempotencyKey.objects.filter(key=clave, endpoint=endpoint, expires_at__lte=ahora).delete()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                key=clave, endpoint=endpoint, request_hash=huella_peticion,
+                expires_at=ahora + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+    except IntegrityError:
+        return repetir(IdempotencyKey.objects.get(key=clave, endpoint=endpoint), huella_peticion)
+    return None
+
+
+def guardar_respuesta(clave, endpoint, status_code, cuerpo):
+    """
+    Guarda la respuesta de la petición en la clave reservada. Llamar en la
+    misma transacción que reclamar, después de hacer el trabajo: la respuesta
+    solo queda guardada si el trabajo se confirma.
+
+    :param clave: Valor de Idempotency-Key (str).
+    :param endpoint: Nombre del endpoint (str).
+    :param status_code: Código HTTP de la respuesta (int).
+    :param cuerpo: Cuerpo de la respuesta; debe ser serializable a JSON.
+    """
+    IdempotencyKey.objects.filter(key=clave, endpoint=endpoint).update(status_code=status_code, response_body=cuerpo)
+
+
+def purgar_vencidas():
+    """
+    Borra las claves vencidas.
+
+    :return: Claves borradas (int).
+    """
+    borradas, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return borradas
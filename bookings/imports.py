@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
+from bookings.models import Booking, SlotOccupancy
+from bookings.slots import slot_de_hora
+from users.models import People
+import bookings.availability as availability
+import bookings.catalog as catalog
+import bookings.conditional as conditional
+import bookings.events as events
+import bookings.occupancy as occupancy
+import bookings.outbox as outbox
+import bookings.utils as utils
+
+# Columnas de cada fila; las mismas claves que recibe create-booking/
+COLUMNAS = [
+    'email', 'name', 'last_name', 'date_of_birth', 'phone_number',
+    'campus_id', 'people_amount', 'booking_date', 'booking_hour', 'observations',
+]
+OBLIGATORIAS = ('email', 'name', 'last_name', 'date_of_birth', 'campus_id', 'people_amount', 'booking_date', 'booking_hour')
+
+FORMATOS = ('csv', 'json')
+
+
+def leer_filas(contenido, formato):
+    """
+    Lee las filas a importar de un archivo CSV (con encabezado) o JSON (lista
+    de objetos).
+
+    :param contenido: Contenido del archivo (str o bytes).
+    :param formato: 'csv' o 'json' (str).
+    :return: Filas (lista de dict).
+    :raises ValueError: Si el formato o el contenido no son válidos.
+    """
+    if isinstance(contenido, bytes):
+        contenido = contenido.decode('utf-8-sig')
+
+    if formato == 'csv':
+        return list(csv.DictReader(io.StringIO(contenido)))
+
+    if formato == 'json':
+        try:
+            filas = json.loads(contenido)
+        except json.JSONDecodeError:
+            raise ValueError("El contenido no es JSON válido.")
+        if not isinstance(filas, list) or not all(isinstance(fila, dict) for fila in filas):
+            raise ValueError("El JSON debe ser una lista de objetos.")
+        return filas
+
+    raise ValueError(f"Formato no soportado: {formato}.")
+
+
+def normalizar_fila(fila):
+    """
+    Valida una fila con las mismas reglas de create-booking/ y la convierte a
+    los tipos del modelo. La hora se acepta como HH:MM o HH:MM AM/PM.
+
+    :param fila: Fila leída (dict).
+    :return: Fila normalizada (dict).
+    :raises ValueError: Si falta un campo o un valor no es válido; el mensaje
+        va en el reporte de la fila, en inglés como los errores de la API.
+    """
+    faltantes = [campo for campo in OBLIGATORIAS if fila.get(campo) in (None, '')]
+    if faltantes:
+        raise ValueError(f"Missing required fields: {', '.join(faltantes)}")
+
+    try:
+        people_amount = int(fila['people_amount'])
+    except (TypeError, ValueError):
+        people_amount = 0
+    if people_amount <= 0:
+        raise ValueError("Invalid people amount")
+
+    try:
+        booking_date = datetime.strptime(str(fila['booking_date']), '%Y-%m-%d').date()
+        date_of_birth = datetime.strptime(str(fila['date_of_birth']), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError("Invalid date (expected YYYY-MM-DD)")
+
+    hora = str(fila['booking_hour']).strip().upper()
+    try:
+        booking_hour = datetime.strptime(utils.convert_to_24(hora) if hora.endswith('M') else hora[:5], '%H:%M').time()
+    except ValueError:
+        raise ValueError("Invalid hour (expected HH:MM or HH:MM AM/PM)")
+
+    campus = catalog.obtener_sede(fila['campus_id'])
+    if campus is None:
+        raise ValueError("Campus not found")
+
+    return {
+        'email': str(fila['email']).strip().upper(),
+        'name': str(fila['name']).strip(),
+        'last_name': str(fila['last_name']).strip(),
+        'date_of_birth': date_of_birth,
+        'phone_number': str(fila.get('phone_number') or '') or None,
+        'campus': campus,
+        'people_amount': people_amount,
+        'booking_date': booking_date,
+        'booking_hour': booking_hour,
+        'booking_slot': slot_de_hora(booking_hour),
+        'observations': fila.get('observations') or '',
+    }
+
+
+def nueva_persona(fila):
+    """
+    Prepara, sin guardarla, la persona de una fila con las mismas reglas de
+    nombres que create-booking/.
+
+    :param fila: Fila normalizada (dict).
+    :return: Persona sin guardar (People).
+    """
+    nombres = fila['name'].split(' ')
+    apellidos = fila['last_name'].split(' ')
+    return People(
+        identification='2222222222',
+        first_name=nombres[0].upper(),
+        second_name=nombres[1].upper() if len(nombres) > 1 else None,
+        first_last_name=apellidos[0].upper(),
+        second_last_name=apellidos[1].upper() if len(apellidos) > 1 else None,
+        date_of_birth=fila['date_of_birth'],
+        phone_number=fila['phone_number'],
+        email=fila['email'],
+    )
+
+
+def buscar_personas(correos):
+    """
+    Busca con una consulta las personas existentes de los correos.
+
+    :param correos: Correos en mayúsculas (conjunto de str).
+    :return: Diccionario email -> People.
+    """
+    personas = {}
+    # Como create-booking/, si hay varias personas con el correo se usa la primera
+    for persona in People.objects.annotate(email_upper=Upper('email')).filter(email_upper__in=correos).order_by('-person_id'):
+        personas[persona.email_upper] = persona
+    return personas
+
+
+def importar_reservas(filas):
+    """
+    Importa reservas en lote. Cada fila se valida igual que en create-booking/;
+    el cupo y los duplicados se verifican en memoria con la ocupación y las
+    reservas activas de las sedes y fechas del lote, leídas con una consulta
+    cada una, bajo el bloqueo de capacidad de cada sede y fecha. Las personas
+    nuevas de las filas aceptadas y sus reservas se insertan con una inserción
+    cada una; las filas rechazadas no escriben nada ni afectan a las demás.
+
+    :param filas: Filas leídas (lista de dict con las claves de COLUMNAS).
+    :return: Reporte por fila (lista de dict con 'row', 'result' y 'booking_id' o 'error').
+    """
+    reporte = [None] * len(filas)
+    validas = []
+    for indice, fila in enumerate(filas):
+        try:
+            validas.append((indice, normalizar_fila(fila)))
+        except ValueError as e:
+            reporte[indice] = {'row': indice + 1, 'result': 'rejected', 'error': str(e)}
+
+    if validas:
+        with transaction.atomic():
+            personas = buscar_personas({fila['email'] for _, fila in validas})
+
+            # Bloquear en orden para no cruzarse con otra importación
+            claves = sorted({(fila['campus'].campus_id, fila['booking_date']) for _, fila in validas})
+            for sede_id, fecha in claves:
+                occupancy.bloquear_capacidad(sede_id, fecha)
+
+            filtro = Q()
+            for sede_id, fecha in claves:
+                filtro |= Q(campus_id=sede_id, occupancy_date=fecha)
+            ocupacion = defaultdict(int)
+            for sede_id, fecha, slot, total in SlotOccupancy.objects.filter(filtro).values_list('campus_id', 'occupancy_date', 'slot', 'people_total'):
+                ocupacion[(sede_id, fecha, slot)] = total
+
+            filtro = Q()
+            for sede_id, fecha in claves:
+                filtro |= Q(campus_id=sede_id, booking_date=fecha)
+            # Reservas activas por correo: las personas nuevas aún no tienen ID
+            correos = {persona.person_id: email for email, persona in personas.items()}
+            existentes = {
+                (correos[person_id], sede_id, fecha)
+                for person_id, sede_id, fecha in Booking.objects.filter(filtro, active=True, person_id__in=list(correos))
+                .values_list('person_id', 'campus_id', 'booking_date')
+            }
+
+            aceptadas = []
+            nuevas = {}
+            for indice, fila in validas:
+                sede_id, fecha, slot = fila['campus'].campus_id, fila['booking_date'], fila['booking_slot']
+
+                if (fila['email'], sede_id, fecha) in existentes:
+                    reporte[indice] = {'row': indice + 1, 'result': 'rejected', 'error': 'Booking already exists'}
+                    continue
+
+                ventana = range(slot - availability.VENTANA_SLOTS, slot + availability.VENTANA_SLOTS + 1)
+                if sum(ocupacion[(sede_id, fecha, franja)] for franja in ventana) + fila['people_amount'] > availability.CAPACIDAD_MAXIMA:
+                    reporte[indice] = {'row': indice + 1, 'result': 'rejected', 'error': 'No availability for the selected hour'}
+                    continue
+
+                ocupacion[(sede_id, fecha, slot)] += fila['people_amount']
+                existentes.add((fila['email'], sede_id, fecha))
+                if fila['email'] not in personas and fila['email'] not in nuevas:
+                    nuevas[fila['email']] = nueva_persona(fila)
+                aceptadas.append((indice, fila))
+
+            # Solo se crean las personas de las filas aceptadas
+            for persona in People.objects.bulk_create(nuevas.values()):
+                personas[persona.email] = persona
+
+            # bulk_create no llama a save(): booking_slot ya viene calculado
+            creadas = Booking.objects.bulk_create([
+                Booking(
+                    person_id=personas[fila['email']], campus_id=fila['campus'], people_amount=fila['people_amount'],
+                    booking_date=fila['booking_date'], booking_hour=fila['booking_hour'], booking_slot=fila['booking_slot'],
+                    observations=fila['observations'], active=True, approved=False,
+                )
+                for _, fila in aceptadas
+            ])
+            for (indice, _), booking in zip(aceptadas, creadas):
+                reporte[indice] = {'row': indice + 1, 'result': 'accepted', 'booking_id': booking.booking_id}
+                events.notificar(booking.campus_id_id, booking.booking_date, 'booking', booking_id=booking.booking_id, change='created')
+
+            personas_por_franja = defaultdict(int)
+            for booking in creadas:
+                personas_por_franja[(booking.campus_id_id, booking.booking_date, booking.booking_slot)] += booking.people_amount
+            for (sede_id, fecha, slot), personas_franja in sorted(personas_por_franja.items()):
+                occupancy.registrar_ocupacion(sede_id, fecha, slot, personas_franja)
+
+            outbox.encolar_correos_reservas(creadas, 'confirmada')
+            for sede_id in sorted({booking.campus_id_id for booking in creadas}):
+                conditional.registrar_cambio(sede_id)
+
+    return reporte
@@ -0,0 +1,152 @@
+import smtplib
+import threading
+import time
+from django.conf import settings
+from django.core.mail import get_connection
+
+# Errores tras los que la conexión se descarta y el envío se reintenta con una nueva
+ERRORES_DE_CONEXION = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+_local = threading.local()
+_lock = threading.Lock()
+_estadisticas = {'sends': 0, 'sent': 0, 'failed': 0, 'connections': 0, 'reconnections': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+
+def _abrir_conexion():
+    conexion = get_connection(fail_silently=False)
+    conexion.open()
+    _local.conexion = conexion
+    _local.abierta_en = time.monotonic()
+    with _lock:
+        _estadisticas['connections'] += 1
+    return conexion
+
+
+def obtener_conexion():
+    """
+    Devuelve la conexión SMTP del hilo actual, abriéndola si no existe o si
+    superó EMAIL_CONNECTION_MAX_AGE (los servidores cierran las conexiones inactivas).
+
+    :return: Conexión abierta (backend de correo de Django).
+    """
+    conexion = getattr(_local, 'conexion', None)
+    if conexion is not None and time.monotonic() - _local.abierta_en <= settings.EMAIL_CONNECTION_MAX_AGE:
+        return conexion
+    cerrar_conexion()
+    return _abrir_conexion()
+
+
+def cerrar_conexion():
+    """
+    Cierra la conexión SMTP del hilo actual, si existe.
+    """
+    conexion = getattr(_local, 'conexion', None)
+    _local.conexion = None
+    if conexion is not None:
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+
+def es_rechazo_permanente(error):
+    """
+    Indica si el error de un envío es un rechazo definitivo del mensaje
+    (código 5xx del servidor o encabezados inválidos), que no tiene sentido
+    reintentar. Tras estos errores la conexión sigue siendo útil.
+
+    :param error: Error del envío (Exception).
+    :return: bool.
+    """
+    if isinstance(error, ValueError):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(codigo >= 500 for codigo, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def enviar_mensaje(mensaje):
+    """
+    Envía un mensaje por la conexión del hilo, sin un saludo SMTP por
+    mensaje. Si la conexión se cayó, abre una nueva y reintenta una vez.
+
+    :param mensaje: Mensaje a enviar (EmailMessage).
+    :return: True si el servidor aceptó el mensaje.
+    :raises Exception: El error del servidor si el envío falla tras reconectar.
+    """
+    inicio = time.perf_counter()
+    try:
+        try:
+            enviados = obtener_conexion().send_messages([mensaje])
+        except ERRORES_DE_CONEXION:
+            cerrar_conexion()
+            with _lock:
+                _estadisticas['reconnections'] += 1
+            enviados = obtener_conexion().send_messages([mensaje])
+    except Exception as e:
+        if not es_rechazo_permanente(e):
+            cerrar_conexion()
+        with _lock:
+            _estadisticas['failed'] += 1
+        raise
+
+    duracion = (time.perf_counter() - inicio) * 1000
+    with _lock:
+        _estadisticas['sends'] += 1
+        _estadisticas['sent'] += enviados or 0
+        _estadisticas['total_ms'] += duracion
+        _estadisticas['max_ms'] = max(_estadisticas['max_ms'], duracion)
+    return bool(enviados)
+
+
+def enviar_mensajes(mensajes):
+    """
+    Envía varios mensajes por la conexión del hilo, de uno en uno: si la
+    conexión se cae a mitad del lote, se sigue desde el primer mensaje no
+    enviado y los ya aceptados no se repiten.
+
+    :param mensajes: Mensajes a enviar (lista de EmailMessage).
+    :return: Número de mensajes enviados (int).
+    :raises Exception: El error del primer mensaje que no se pudo enviar; los anteriores ya se enviaron.
+    """
+    return sum(enviar_mensaje(mensaje) for mensaje in mensajes)
+
+
+def enviar_correo(mensaje, fail_silently=True):
+    """
+    Envía un mensaje por la conexión compartida del hilo.
+
+    :param mensaje: Mensaje a enviar (EmailMessage).
+    :param fail_silently: Si es False, el error del servidor se propaga en lugar de devolver False (bool).
+    :return: True si el correo se envió correctamente, False en caso contrario.
+    :raises Exception: El error del servidor, si fail_silently es False.
+    """
+    try:
+        return enviar_mensaje(mensaje)
+    except Exception as e:
+        if not fail_silently:
+            raise
+        print(f"Error al enviar el correo: {e}")
+        return False
+
+
+def estadisticas():
+    """
+    Devuelve los contadores de envío del proceso.
+
+    :return: Diccionario con envíos exitosos, mensajes enviados y fallidos,
+        conexiones abiertas, reconexiones y latencia media y máxima por mensaje en milisegundos.
+    """
+    with _lock:
+        datos = dict(_estadisticas)
+    datos['avg_ms'] = round(datos.pop('total_ms') / datos['sends'], 3) if datos['sends'] else 0.0
+    datos['max_ms'] = round(datos['max_ms'], 3)
+    return datos
+
+
+def reiniciar_estadisticas():
+    with _lock:
+        for clave in _estadisticas:
+            _estadisticas[clave] = 0
@@ -0,0 +1,44 @@
+import time
+from django.core.management.base import BaseCommand
+import bookings.emails as emails
+
+# Contexto de ejemplo de cada correo, con los datos que arma bookings/utils.py
+EJEMPLOS = {
+    'booking confirmation': ('reserva_cliente', {
+        'saludo': 'Ana Pérez', 'estado_reserva': 'confirmada',
+        'detalles': [('Sede', 'Sede 1'), ('Fecha', '2099-01-01'), ('Hora', '19:00'), ('Cantidad de personas', 4), ('Observaciones', 'Mesa <cerca> de la ventana & terraza')],
+    }),
+    'booking cancellation': ('reserva_sede', {
+        'saludo': 'Sede 1', 'estado_reserva': 'cancelada',
+        'detalles': [('Nombre del cliente', 'Ana Pérez'), ('Fecha', '2099-01-01'), ('Hora', '19:00'), ('Cantidad de personas', 4), ('Celular', '3000000000'), ('Observaciones', 'Sin observaciones')],
+    }),
+    'password reset': ('recuperacion_contrasena', {
+        'saludo': 'ana.perez', 'detalles': [('Nueva contraseña', 'a1<b2>&c3')],
+    }),
+    'welcome': ('creacion_usuario', {
+        'saludo': 'Ana Pérez', 'detalles': [('Nombre de usuario', 'ana.perez'), ('Contraseña', '1234567890')],
+    }),
+}
+
+
+class Command(BaseCommand):
+    help = 'Measures the render time per message (HTML and plain text) of each email template.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        iteraciones = options['iterations']
+
+        inicio = time.perf_counter()
+        for tipo, contexto in EJEMPLOS.values():
+            emails.renderizar_correo(tipo, contexto)
+        self.stdout.write(f'First render of all templates (includes compiling): {(time.perf_counter() - inicio) * 1000:.2f} ms')
+
+        self.stdout.write(f'{"email":<24}{"us per message":>16}{"html bytes":>12}{"text bytes":>12}')
+        for nombre, (tipo, contexto) in EJEMPLOS.items():
+            inicio = time.perf_counter()
+            for _ in range(iteraciones):
+                texto, html = emails.renderizar_correo(tipo, contexto)
+            por_mensaje = (time.perf_counter() - inicio) / iteraciones * 1_000_000
+            self.stdout.write(f'{nombre:<24}{por_mensaje:>16.1f}{len(html):>12}{len(texto):>12}')
@@ -0,0 +1,130 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from bookings.models import Campus, Booking
+from users.models import People, Users
+
+MODELOS_CON_INDICES = (Booking, People, Users)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a large dataset inside a transaction and times the hot booking, people and '
+        'users queries with and without the composite indexes. Everything is rolled back. '
+        'Requires PostgreSQL (transactional DDL).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=200000)
+        parser.add_argument('--people', type=int, default=20000)
+        parser.add_argument('--campuses', type=int, default=4)
+        parser.add_argument('--repeat', type=int, default=30, help='Runs per query and phase.')
+        parser.add_argument('--explain', action='store_true', help='Print the query plans.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark needs PostgreSQL: it drops indexes inside a transaction that is rolled back.')
+
+        random.seed(1)
+        with transaction.atomic():
+            muestras = self.sembrar(options)
+            self.analizar()
+
+            con_indices = self.medir(muestras, options)
+            with connection.schema_editor() as editor:
+                for modelo in MODELOS_CON_INDICES:
+                    for indice in modelo._meta.indexes:
+                        editor.remove_index(modelo, indice)
+            self.analizar()
+            sin_indices = self.medir(muestras, options)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{"query":<28}{"no indexes (ms)":>18}{"indexes (ms)":>15}{"speedup":>10}')
+        for nombre, (tiempo_con, plan_con) in con_indices.items():
+            tiempo_sin, plan_sin = sin_indices[nombre]
+            self.stdout.write(f'{nombre:<28}{tiempo_sin:>18.3f}{tiempo_con:>15.3f}{tiempo_sin / tiempo_con:>9.1f}x')
+            if options['explain']:
+                self.stdout.write(f'  without indexes:\n    {plan_sin}\n  with indexes:\n    {plan_con}')
+
+    def sembrar(self, options):
+        hoy = date.today()
+        sedes = Campus.objects.bulk_create([
+            Campus(name=f'Benchmark {numero}', address='-', phone='-', email='benchmark@example.com')
+            for numero in range(options['campuses'])
+        ])
+        personas = People.objects.bulk_create([
+            People(
+                identification=str(10000000 + numero),
+                first_name='BENCH',
+                first_last_name=f'PERSON{numero}',
+                date_of_birth=date(1990, 1, 1),
+                email=f'BENCH{numero}@EXAMPLE.COM',
+            )
+            for numero in range(options['people'])
+        ], batch_size=5000)
+        usuarios = Users.objects.bulk_create([
+            Users(username=f'bench.person{numero}', password_hash='-', person_id=persona)
+            for numero, persona in enumerate(personas[::10])
+        ], batch_size=5000)
+
+        reservas = []
+        for _ in range(options['bookings']):
+            slot = random.randint(44, 83)
+            reservas.append(Booking(
+                person_id=random.choice(personas),
+                campus_id=random.choice(sedes),
+                people_amount=random.randint(1, 8),
+                booking_date=hoy + timedelta(days=random.randint(-365, 365)),
+                booking_hour=f'{slot // 4:02d}:{slot % 4 * 15:02d}',
+                booking_slot=slot,
+                active=random.random() < 0.3,
+            ))
+            if len(reservas) == 5000:
+                Booking.objects.bulk_create(reservas)
+                reservas = []
+        Booking.objects.bulk_create(reservas)
+
+        return {'sedes': sedes, 'personas': personas, 'usuarios': usuarios, 'hoy': hoy}
+
+    def analizar(self):
+        with connection.cursor() as cursor:
+            for modelo in MODELOS_CON_INDICES:
+                cursor.execute(f'ANALYZE "{modelo._meta.db_table}"')
+
+    def consultas(self, muestras):
+        hoy = muestras['hoy']
+        sede = random.choice(muestras['sedes'])
+        persona = random.choice(muestras['personas'])
+        usuario = random.choice(muestras['usuarios'])
+        fecha = hoy + timedelta(days=random.randint(0, 60))
+        slot = random.randint(44, 83)
+
+        return {
+            'capacity_window': Booking.objects.filter(active=True, campus_id=sede, booking_date=fecha, booking_slot__range=(slot - 5, slot + 5)),
+            'campus_list_from_today': Booking.objects.filter(campus_id=sede, booking_date__gte=hoy).order_by('booking_date', 'booking_slot', 'booking_hour')[:100],
+            'person_active_bookings': Booking.objects.filter(person_id=persona, active=True),
+            'person_campus_duplicate': Booking.objects.filter(campus_id=sede, person_id=persona, active=True),
+            'people_by_email': People.objects.filter(email=persona.email),
+            'people_by_identification': People.objects.filter(identification=persona.identification),
+            'users_by_username': Users.objects.filter(username=usuario.username),
+        }
+
+    def medir(self, muestras, options):
+        tiempos = {}
+        planes = {}
+        for _ in range(options['repeat']):
+            for nombre, consulta in self.consultas(muestras).items():
+                inicio = time.perf_counter()
+                if nombre == 'capacity_window':
+                    consulta.aggregate(Sum('people_amount'))
+                else:
+                    list(consulta)
+                tiempos.setdefault(nombre, []).append((time.perf_counter() - inicio) * 1000)
+                if nombre not in planes:
+                    planes[nombre] = consulta.explain().replace('\n', '\n    ')
+        return {nombre: (statistics.median(valores), planes[nombre]) for nombre, valores in tiempos.items()}
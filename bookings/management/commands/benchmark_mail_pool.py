@@ -0,0 +1,65 @@
+import threading
+import time
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from bookings.testing import ServidorSMTPLocal
+import bookings.mailing as mailing
+
+
+class Command(BaseCommand):
+    help = (
+        'Starts an in-process SMTP stand-in and compares sending with a new connection per '
+        'message against the pooled connection of bookings.mailing, including a reconnect '
+        'after the server drops the connection.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=50)
+        parser.add_argument('--handshake-ms', type=float, default=20, help='Simulated delay of the greeting and EHLO.')
+
+    def handle(self, *args, **options):
+        servidor = ServidorSMTPLocal(options['handshake_ms'] / 1000)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        host, port = servidor.server_address
+        total = options['messages']
+
+        def mensaje(numero):
+            return EmailMessage(f'Prueba {numero}', '<p>Prueba</p>', 'reservas@example.com', ['cliente@example.com'])
+
+        configuracion = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': host, 'EMAIL_PORT': port,
+            'EMAIL_USE_SSL': False, 'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': '', 'EMAIL_HOST_PASSWORD': '',
+        }
+        try:
+            with override_settings(**configuracion):
+                inicio = time.perf_counter()
+                for numero in range(total):
+                    mensaje(numero).send()
+                sin_pool = time.perf_counter() - inicio
+                conexiones_sin_pool = servidor.conexiones
+
+                mailing.cerrar_conexion()
+                mailing.reiniciar_estadisticas()
+                inicio = time.perf_counter()
+                for numero in range(total):
+                    if numero == total // 2:
+                        servidor.cortar_conexiones()
+                    if not mailing.enviar_correo(mensaje(numero)):
+                        raise CommandError(f'Pooled send {numero} failed.')
+                con_pool = time.perf_counter() - inicio
+                mailing.cerrar_conexion()
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+        estadisticas = mailing.estadisticas()
+        self.stdout.write(f'New connection per message: {sin_pool * 1000:.1f} ms, {conexiones_sin_pool} connections')
+        self.stdout.write(f'Pooled connection:          {con_pool * 1000:.1f} ms, {estadisticas["connections"]} connections, {estadisticas["reconnections"]} reconnections')
+        self.stdout.write(f'Pooled send latency: avg {estadisticas["avg_ms"]} ms, max {estadisticas["max_ms"]} ms')
+
+        if len(servidor.mensajes) != 2 * total:
+            raise CommandError(f'The stand-in received {len(servidor.mensajes)} of {2 * total} messages.')
+        self.stdout.write(self.style.SUCCESS(f'All {2 * total} messages delivered.'))
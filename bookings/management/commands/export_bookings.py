@@ -0,0 +1,35 @@
+import sys
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from bookings import exports
+
+
+def _fecha(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date: {valor} (expected YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = 'Streams bookings as CSV or NDJSON to a file or stdout with flat memory use.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campus-id', type=int, help='Only export this campus.')
+        parser.add_argument('--date-from', type=_fecha, help='First date (YYYY-MM-DD).')
+        parser.add_argument('--date-to', type=_fecha, help='Last date (YYYY-MM-DD).')
+        parser.add_argument('--state', type=str.upper, choices=list(exports.FILTROS_ESTADO), help='Only bookings in this state.')
+        parser.add_argument('--format', dest='export_format', choices=list(exports.FORMATOS), default='csv')
+        parser.add_argument('--output', help='Destination file (default stdout).')
+
+    def handle(self, *args, **options):
+        lineas, _ = exports.FORMATOS[options['export_format']]
+        filas = exports.filas_reservas(options['campus_id'], options['date_from'], options['date_to'], options['state'])
+
+        destino = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            for linea in lineas(filas):
+                destino.write(linea)
+        finally:
+            if options['output']:
+                destino.close()
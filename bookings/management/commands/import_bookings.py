@@ -0,0 +1,29 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from bookings import imports
+
+
+class Command(BaseCommand):
+    help = 'Imports bookings from a CSV or JSON file and prints a per-row accept/reject report.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header) or JSON (list of objects) file.')
+        parser.add_argument('--format', dest='import_format', choices=imports.FORMATOS, help='File format (default: from the extension).')
+
+    def handle(self, *args, **options):
+        import_format = options['import_format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if import_format not in imports.FORMATOS:
+            raise CommandError('Unknown format; use --format csv or --format json.')
+
+        try:
+            with open(options['path'], 'rb') as archivo:
+                filas = imports.leer_filas(archivo.read(), import_format)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'Could not read {options["path"]}: {e}')
+
+        reporte = imports.importar_reservas(filas)
+        for fila in reporte:
+            self.stdout.write(json.dumps(fila, ensure_ascii=False))
+
+        aceptadas = sum(1 for fila in reporte if fila['result'] == 'accepted')
+        self.stdout.write(self.style.SUCCESS(f'{aceptadas} accepted, {len(reporte) - aceptadas} rejected'))
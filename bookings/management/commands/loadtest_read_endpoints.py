@@ -0,0 +1,150 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from wsgiref.util import setup_testing_defaults
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+
+def peticion_wsgi(aplicacion, ruta, host):
+    """
+    Atiende un GET con la aplicación WSGI, como lo haría el servidor.
+
+    :return: Tupla (status, cuerpo).
+    """
+    path, _, query = ruta.partition('?')
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'HTTP_HOST': host}
+    setup_testing_defaults(environ)
+    estado = []
+    respuesta = aplicacion(environ, lambda status, headers, exc_info=None: estado.append(status))
+    try:
+        cuerpo = b''.join(respuesta)
+    finally:
+        respuesta.close()
+    return int(estado[0].split()[0]), cuerpo
+
+
+async def peticion_asgi(aplicacion, ruta, host):
+    """
+    Atiende un GET con la aplicación ASGI, como lo haría el servidor.
+
+    :return: Tupla (status, cuerpo).
+    """
+    path, _, query = ruta.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+        'headers': [(b'host', host.encode())], 'server': (host, 80), 'client': ('127.0.0.1', 0),
+    }
+    mensajes = []
+    terminada = asyncio.Event()
+    cuerpo_enviado = False
+
+    async def receive():
+        nonlocal cuerpo_enviado
+        if not cuerpo_enviado:
+            cuerpo_enviado = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await terminada.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(mensaje):
+        mensajes.append(mensaje)
+        if mensaje['type'] == 'http.response.body' and not mensaje.get('more_body'):
+            terminada.set()
+
+    await aplicacion(scope, receive, send)
+    return mensajes[0]['status'], b''.join(mensaje.get('body', b'') for mensaje in mensajes[1:])
+
+
+def _percentil(valores, percentil):
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * percentil / 100), len(ordenados) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Fires concurrent requests at the read endpoints through the WSGI handler (sync DRF views, '
+        'one thread per concurrent request) and through the ASGI handler (async/ views, one event loop), '
+        'checks both return the same responses and compares throughput and latency. '
+        'Runs in-process against the same handlers the servers use, without network overhead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and handler.')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--campus-id', type=int, default=1)
+        parser.add_argument('--booking-date', default=(date.today() + timedelta(days=1)).isoformat(), help='Date for list-hours (YYYY-MM-DD).')
+        parser.add_argument('--booking-id', type=int, default=1)
+        parser.add_argument('--person-id', type=int, default=1)
+        parser.add_argument('--host', help='Host header (default: first entry of ALLOWED_HOSTS, or localhost).')
+
+    def handle(self, *args, **options):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*']
+        host = options['host'] or (hosts[0].lstrip('.') if hosts else 'localhost')
+        rutas = [
+            ('list-campuses', 'list-campuses/'),
+            ('list-hours', f"list-hours/?campus_id={options['campus_id']}&booking_date={options['booking_date']}&people_amount=2"),
+            ('list-bookings', f"list-bookings/{options['campus_id']}/"),
+            ('booking-id', f"booking-id/{options['booking_id']}/"),
+            ('booking-by-person', f"booking-by-person/{options['person_id']}/"),
+        ]
+
+        self.stdout.write(f"{'endpoint':<20}{'handler':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+        for nombre, ruta in rutas:
+            sincrono = self.medir_wsgi(f'/api/bookings/{ruta}', host, options)
+            asincrono = asyncio.run(self.medir_asgi(f'/api/bookings/async/{ruta}', host, options))
+
+            if (sincrono['status'], sincrono['body']) != (asincrono['status'], asincrono['body']):
+                raise CommandError(f'{nombre}: sync and async responses differ ({sincrono["status"]} vs {asincrono["status"]})')
+
+            for handler, resultado in (('wsgi', sincrono), ('asgi', asincrono)):
+                self.stdout.write(
+                    f"{nombre:<20}{handler:<8}{resultado['rps']:>10.1f}{resultado['p50']:>10.2f}"
+                    f"{resultado['p95']:>10.2f}{resultado['errors']:>8}"
+                )
+
+    def resumen(self, resultados, duracion, primera):
+        latencias = [latencia for latencia, _ in resultados]
+        status, cuerpo = primera
+        return {
+            'rps': len(latencias) / duracion,
+            'p50': _percentil(latencias, 50) * 1000,
+            'p95': _percentil(latencias, 95) * 1000,
+            'errors': sum(error for _, error in resultados),
+            'status': status,
+            'body': json.loads(cuerpo) if cuerpo else None,
+        }
+
+    def medir_wsgi(self, ruta, host, options):
+        aplicacion = WSGIHandler()
+        primera = peticion_wsgi(aplicacion, ruta, host)
+
+        def peticion(_):
+            inicio = time.perf_counter()
+            status, _ = peticion_wsgi(aplicacion, ruta, host)
+            return time.perf_counter() - inicio, status >= 500
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            resultados = list(pool.map(peticion, range(options['requests'])))
+        return self.resumen(resultados, time.perf_counter() - inicio, primera)
+
+    async def medir_asgi(self, ruta, host, options):
+        aplicacion = ASGIHandler()
+        primera = await peticion_asgi(aplicacion, ruta, host)
+        limite = asyncio.Semaphore(options['concurrency'])
+
+        async def peticion():
+            async with limite:
+                inicio = time.perf_counter()
+                status, _ = await peticion_asgi(aplicacion, ruta, host)
+                return time.perf_counter() - inicio, status >= 500
+
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(peticion() for _ in range(options['requests'])))
+        return self.resumen(resultados, time.perf_counter() - inicio, primera)
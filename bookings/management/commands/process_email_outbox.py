@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from bookings.outbox import procesar_lote
+import bookings.mailing as mailing
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends the pending emails of the outbox in batches, retrying failures with '
+        'exponential backoff. Several workers can run at the same time.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Emails per batch (default EMAIL_OUTBOX_BATCH_SIZE).')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll for new emails.')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls when the outbox is empty.')
+
+    def handle(self, *args, **options):
+        total_enviados = total_fallidos = 0
+        while True:
+            close_old_connections()
+            enviados, fallidos = procesar_lote(options['batch_size'])
+            total_enviados += enviados
+            total_fallidos += fallidos
+            if enviados or fallidos:
+                self.stdout.write(f'Batch: {enviados} sent, {fallidos} failed.')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        mailing.cerrar_conexion()
+        estadisticas = mailing.estadisticas()
+        self.stdout.write(f'SMTP: {estadisticas["connections"]} connections, average send {estadisticas["avg_ms"]} ms, max {estadisticas["max_ms"]} ms.')
+        self.stdout.write(self.style.SUCCESS(f'Outbox processed: {total_enviados} sent, {total_fallidos} failed.'))
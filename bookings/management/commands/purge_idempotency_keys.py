@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from bookings import idempotency
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL. Run it periodically (e.g. cron).'
+
+    def handle(self, *args, **options):
+        borradas = idempotency.purgar_vencidas()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {borradas} expired idempotency keys'))
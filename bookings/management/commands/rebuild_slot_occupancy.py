@@ -0,0 +1,23 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from bookings.occupancy import reconstruir_ocupacion
+
+
+def _fecha(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date: {valor} (expected YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SlotOccupancy table from active bookings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campus-id', type=int, help='Only rebuild this campus.')
+        parser.add_argument('--date-from', type=_fecha, help='First date to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--date-to', type=_fecha, help='Last date to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        total = reconstruir_ocupacion(options['campus_id'], options['date_from'], options['date_to'])
+        self.stdout.write(self.style.SUCCESS(f'Slot occupancy rebuilt: {total} slots written.'))
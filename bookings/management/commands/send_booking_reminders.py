@@ -0,0 +1,32 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from bookings.reminders import enviar_recordatorios
+import bookings.mailing as mailing
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends reminder emails for the active bookings of the next hours, in batches over a '
+        'pooled SMTP connection. Overlapping runs never remind the same booking twice.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours-ahead', type=int, help='Reminder window (default BOOKING_REMINDER_HOURS_BEFORE).')
+        parser.add_argument('--batch-size', type=int, help='Bookings per batch (default BOOKING_REMINDER_BATCH_SIZE).')
+        parser.add_argument('--loop', action='store_true', help='Keep running and scan again every --interval seconds.')
+        parser.add_argument('--interval', type=float, default=300)
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            recordadas, enviados, liberadas, errores = enviar_recordatorios(options['hours_ahead'], options['batch_size'])
+            for ids, error in errores:
+                self.stderr.write(self.style.ERROR(f'Reminder for bookings {ids} failed: {error}'))
+            self.stdout.write(f'Reminders: {recordadas} bookings in {enviados} emails, {liberadas} released after an error.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        mailing.cerrar_conexion()
+        self.stdout.write(self.style.SUCCESS('Booking reminders processed.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from bookings.digests import enviar_resumenes_vencidos
+
+
+class Command(BaseCommand):
+    help = (
+        'Queues the booking digest email of every campus in digest mode whose interval has '
+        'elapsed (or whose service just started). Run it every few minutes; '
+        'process_email_outbox delivers the emails.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Send every pending digest now.')
+
+    def handle(self, *args, **options):
+        enviados = enviar_resumenes_vencidos(forzar=options['force'])
+        for campus_id, total in enviados.items():
+            self.stdout.write(f'Campus {campus_id}: digest with {total} bookings queued.')
+        self.stdout.write(self.style.SUCCESS(f'{len(enviados)} digests queued.'))
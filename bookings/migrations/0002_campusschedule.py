@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CampusSchedule',
+            fields=[
+                ('schedule_id', models.AutoField(db_column='schedule_id', primary_key=True, serialize=False)),
+                ('day_type', models.CharField(choices=[('REGULAR', 'Día regular'), ('HOLIDAY', 'Festivo'), ('HOLIDAY_EVE', 'Víspera de festivo')], db_column='day_type', default='REGULAR', max_length=11)),
+                ('weekday', models.SmallIntegerField(blank=True, choices=[(0, 'Lunes'), (1, 'Martes'), (2, 'Miércoles'), (3, 'Jueves'), (4, 'Viernes'), (5, 'Sábado'), (6, 'Domingo')], db_column='weekday', null=True)),
+                ('start_time', models.TimeField(db_column='start_time')),
+                ('end_time', models.TimeField(db_column='end_time')),
+                ('campus_id', models.ForeignKey(db_column='campus_id', on_delete=django.db.models.deletion.CASCADE, to='bookings.campus')),
+            ],
+            options={
+                'verbose_name': 'Campus Schedule',
+                'verbose_name_plural': 'Campus Schedules',
+                'db_table': 'CampusSchedule',
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from datetime import time
+from django.db import migrations
+
+# Horarios que estaban fijos en bookings/utils.py (HORARIOS_SEDES).
+# (campus_id, day_type, weekday, start_time, end_time); weekday None = todos los días
+HORARIOS_INICIALES = [
+    (1, 'REGULAR', None, time(12, 0), time(19, 1)),
+    *[(2, 'REGULAR', dia, inicio, fin) for dia in (0, 1, 2, 3) for inicio, fin in [(time(12, 0), time(13, 16)), (time(19, 0), time(20, 1))]],
+    *[(2, 'REGULAR', dia, inicio, fin) for dia in (4, 5) for inicio, fin in [(time(12, 0), time(13, 46)), (time(19, 0), time(20, 1))]],
+    (2, 'REGULAR', 6, time(11, 0), time(15, 46)),
+    (2, 'HOLIDAY', None, time(11, 0), time(15, 46)),
+    (2, 'HOLIDAY_EVE', 6, time(12, 0), time(15, 31)),
+    (2, 'HOLIDAY_EVE', 6, time(19, 0), time(20, 1)),
+]
+
+
+def crear_horarios(apps, schema_editor):
+    Campus = apps.get_model('bookings', 'Campus')
+    CampusSchedule = apps.get_model('bookings', 'CampusSchedule')
+
+    sedes = set(Campus.objects.values_list('campus_id', flat=True))
+    CampusSchedule.objects.bulk_create([
+        CampusSchedule(campus_id_id=campus_id, day_type=day_type, weekday=weekday, start_time=inicio, end_time=fin)
+        for campus_id, day_type, weekday, inicio, fin in HORARIOS_INICIALES
+        if campus_id in sedes
+    ])
+
+
+def borrar_horarios(apps, schema_editor):
+    CampusSchedule = apps.get_model('bookings', 'CampusSchedule')
+    CampusSchedule.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_campusschedule'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_horarios, borrar_horarios),
+    ]
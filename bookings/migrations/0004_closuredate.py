@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_seed_campus_schedules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClosureDate',
+            fields=[
+                ('closure_id', models.AutoField(db_column='closure_id', primary_key=True, serialize=False)),
+                ('closure_date', models.DateField(db_column='closure_date')),
+                ('every_year', models.BooleanField(db_column='every_year', default=False)),
+                ('description', models.CharField(blank=True, db_column='description', max_length=150, null=True)),
+            ],
+            options={
+                'verbose_name': 'Closure Date',
+                'verbose_name_plural': 'Closure Dates',
+                'db_table': 'ClosureDate',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from datetime import date
+from django.db import migrations
+
+# Fechas de cierre que estaban fijas en bookings/utils.py (obtener_horarios_permitidos).
+# (closure_date, every_year, description)
+CIERRES_INICIALES = [
+    (date(2025, 12, 25), True, 'Navidad'),
+    (date(2025, 1, 1), True, 'Año nuevo'),
+    (date(2025, 3, 8), False, None),
+    (date(2025, 5, 11), False, None),
+    (date(2025, 12, 22), False, None),
+    (date(2026, 3, 8), False, None),
+    (date(2026, 5, 10), False, None),
+]
+
+
+def crear_cierres(apps, schema_editor):
+    ClosureDate = apps.get_model('bookings', 'ClosureDate')
+    ClosureDate.objects.bulk_create([
+        ClosureDate(closure_date=fecha, every_year=every_year, description=description)
+        for fecha, every_year, description in CIERRES_INICIALES
+    ])
+
+
+def borrar_cierres(apps, schema_editor):
+    ClosureDate = apps.get_model('bookings', 'ClosureDate')
+    ClosureDate.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_closuredate'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_cierres, borrar_cierres),
+    ]
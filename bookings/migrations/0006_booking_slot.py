@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def calcular_slots(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    horas = Booking.objects.filter(booking_slot__isnull=True).values_list('booking_hour', flat=True).distinct()
+    for hora in list(horas):
+        Booking.objects.filter(booking_hour=hora).update(booking_slot=(hora.hour * 60 + hora.minute) // 15)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_seed_closure_dates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='booking_slot',
+            field=models.SmallIntegerField(db_column='booking_slot', editable=False, null=True),
+        ),
+        migrations.RunPython(calcular_slots, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='booking_slot',
+            field=models.SmallIntegerField(db_column='booking_slot', db_index=True, editable=False),
+        ),
+    ]
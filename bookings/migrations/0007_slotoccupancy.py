@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_booking_slot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotOccupancy',
+            fields=[
+                ('occupancy_id', models.AutoField(db_column='occupancy_id', primary_key=True, serialize=False)),
+                ('occupancy_date', models.DateField(db_column='occupancy_date')),
+                ('slot', models.SmallIntegerField(db_column='slot')),
+                ('people_total', models.IntegerField(db_column='people_total', default=0)),
+                ('campus_id', models.ForeignKey(db_column='campus_id', on_delete=django.db.models.deletion.CASCADE, to='bookings.campus')),
+            ],
+            options={
+                'verbose_name': 'Slot Occupancy',
+                'verbose_name_plural': 'Slot Occupancies',
+                'db_table': 'SlotOccupancy',
+                'unique_together': {('campus_id', 'occupancy_date', 'slot')},
+            },
+        ),
+    ]
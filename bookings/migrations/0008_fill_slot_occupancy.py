@@ -0,0 +1,29 @@
+from django.db import migrations
+from django.db.models import Sum
+
+
+def llenar_ocupacion(apps, schema_editor):
+    Booking = apps.get_model('bookings', 'Booking')
+    SlotOccupancy = apps.get_model('bookings', 'SlotOccupancy')
+
+    totales = Booking.objects.filter(active=True).values('campus_id', 'booking_date', 'booking_slot').annotate(total=Sum('people_amount')).order_by()
+    SlotOccupancy.objects.bulk_create([
+        SlotOccupancy(campus_id_id=fila['campus_id'], occupancy_date=fila['booking_date'], slot=fila['booking_slot'], people_total=fila['total'])
+        for fila in totales
+    ], batch_size=1000)
+
+
+def vaciar_ocupacion(apps, schema_editor):
+    SlotOccupancy = apps.get_model('bookings', 'SlotOccupancy')
+    SlotOccupancy.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_slotoccupancy'),
+    ]
+
+    operations = [
+        migrations.RunPython(llenar_ocupacion, vaciar_ocupacion),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_fill_slot_occupancy'),
+        ('users', '0002_people_users_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='booking_slot',
+            field=models.SmallIntegerField(db_column='booking_slot', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('active', True)), fields=['campus_id', 'booking_date', 'booking_slot'], name='booking_campus_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['campus_id', 'booking_date', 'booking_slot', 'booking_id'], name='booking_campus_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('active', True)), fields=['person_id', 'booking_date'], name='booking_person_active_idx'),
+        ),
+    ]
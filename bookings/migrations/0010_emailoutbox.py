@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_booking_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('outbox_id', models.AutoField(db_column='outbox_id', primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('BOOKING_CUSTOMER', 'Booking customer'), ('BOOKING_CAMPUS', 'Booking campus')], db_column='kind', max_length=30)),
+                ('payload', models.JSONField(db_column='payload')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], db_column='status', default='PENDING', max_length=10)),
+                ('attempts', models.IntegerField(db_column='attempts', default=0)),
+                ('next_attempt_at', models.DateTimeField(db_column='next_attempt_at')),
+                ('last_error', models.TextField(blank=True, db_column='last_error', null=True)),
+                ('creation_date', models.DateTimeField(auto_now_add=True, db_column='creation_date')),
+                ('sent_date', models.DateTimeField(blank=True, db_column='sent_date', null=True)),
+            ],
+            options={
+                'verbose_name': 'Email Outbox',
+                'verbose_name_plural': 'Email Outbox',
+                'db_table': 'EmailOutbox',
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDING')), fields=['next_attempt_at'], name='outbox_pending_idx')],
+            },
+        ),
+    ]
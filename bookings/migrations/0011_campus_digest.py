@@ -0,0 +1,57 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campus',
+            name='digest_at_service_start',
+            field=models.BooleanField(db_column='digest_at_service_start', default=False),
+        ),
+        migrations.AddField(
+            model_name='campus',
+            name='digest_interval_minutes',
+            field=models.PositiveIntegerField(db_column='digest_interval_minutes', default=15),
+        ),
+        migrations.AddField(
+            model_name='campus',
+            name='last_digest_at',
+            field=models.DateTimeField(blank=True, db_column='last_digest_at', null=True),
+        ),
+        migrations.AddField(
+            model_name='campus',
+            name='notification_mode',
+            field=models.CharField(choices=[('IMMEDIATE', 'Un correo por reserva'), ('DIGEST', 'Resumen periódico')], db_column='notification_mode', default='IMMEDIATE', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='kind',
+            field=models.CharField(choices=[('BOOKING_CUSTOMER', 'Booking customer'), ('BOOKING_CAMPUS', 'Booking campus'), ('CAMPUS_DIGEST', 'Campus digest')], db_column='kind', max_length=30),
+        ),
+        migrations.CreateModel(
+            name='CampusDigestEvent',
+            fields=[
+                ('event_id', models.AutoField(db_column='event_id', primary_key=True, serialize=False)),
+                ('booking_status', models.CharField(db_column='booking_status', max_length=20)),
+                ('payload', models.JSONField(db_column='payload')),
+                ('creation_date', models.DateTimeField(auto_now_add=True, db_column='creation_date')),
+                ('digest_sent_at', models.DateTimeField(blank=True, db_column='digest_sent_at', null=True)),
+                ('booking_id', models.ForeignKey(db_column='booking_id', on_delete=django.db.models.deletion.CASCADE, to='bookings.booking')),
+                ('campus_id', models.ForeignKey(db_column='campus_id', on_delete=django.db.models.deletion.CASCADE, to='bookings.campus')),
+            ],
+            options={
+                'verbose_name': 'Campus Digest Event',
+                'verbose_name_plural': 'Campus Digest Events',
+                'db_table': 'CampusDigestEvent',
+                'indexes': [models.Index(condition=models.Q(('digest_sent_at__isnull', True)), fields=['campus_id', 'creation_date'], name='digest_event_pending_idx')],
+            },
+        ),
+    ]
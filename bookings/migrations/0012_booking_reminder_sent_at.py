@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0011_campus_digest'),
+        ('users', '0002_people_users_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, db_column='reminder_sent_at', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('active', True), ('reminder_sent_at__isnull', True)), fields=['booking_date', 'booking_slot'], name='booking_reminder_pending_idx'),
+        ),
+    ]
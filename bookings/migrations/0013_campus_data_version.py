@@ -0,0 +1,28 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_booking_reminder_sent_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campus',
+            name='data_version',
+            field=models.PositiveBigIntegerField(db_column='data_version', default=0),
+        ),
+        migrations.AddField(
+            model_name='campus',
+            name='data_modified',
+            field=models.DateTimeField(blank=True, db_column='data_modified', null=True),
+        ),
+        migrations.AddField(
+            model_name='campus',
+            name='modification_date',
+            field=models.DateTimeField(auto_now=True, db_column='modification_date', default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
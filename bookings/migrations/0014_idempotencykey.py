@@ -0,0 +1,33 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0013_campus_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('idempotency_id', models.AutoField(db_column='idempotency_id', primary_key=True, serialize=False)),
+                ('key', models.CharField(db_column='key', max_length=255)),
+                ('endpoint', models.CharField(db_column='endpoint', max_length=100)),
+                ('request_hash', models.CharField(db_column='request_hash', max_length=64)),
+                ('status_code', models.SmallIntegerField(blank=True, db_column='status_code', null=True)),
+                ('response_body', models.JSONField(blank=True, db_column='response_body', null=True)),
+                ('creation_date', models.DateTimeField(auto_now_add=True, db_column='creation_date')),
+                ('expires_at', models.DateTimeField(db_column='expires_at')),
+            ],
+            options={
+                'verbose_name': 'Idempotency Key',
+                'verbose_name_plural': 'Idempotency Keys',
+                'db_table': 'IdempotencyKey',
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_expires_idx')],
+                'unique_together': {('key', 'endpoint')},
+            },
+        ),
+    ]
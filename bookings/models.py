@@ -1,11 +1,26 @@
 from django.db import models
+from bookings.slots import slot_de_hora
 
 class Campus(models.Model):
+    IMMEDIATE = 'IMMEDIATE'
+    DIGEST = 'DIGEST'
+    NOTIFICATION_MODE_CHOICES = [
+        (IMMEDIATE, 'Un correo por reserva'),
+        (DIGEST, 'Resumen periódico'),
+    ]
+
     campus_id = models.AutoField(primary_key=True, db_column='campus_id')
     name = models.CharField(max_length=100, db_column='name')
     address = models.CharField(max_length=150, db_column='address')
     phone = models.CharField(max_length=15, db_column='phone')
     email = models.EmailField(db_column='email')
+    notification_mode = models.CharField(max_length=10, choices=NOTIFICATION_MODE_CHOICES, default=IMMEDIATE, db_column='notification_mode')
+    digest_interval_minutes = models.PositiveIntegerField(default=15, db_column='digest_interval_minutes')
+    digest_at_service_start = models.BooleanField(default=False, db_column='digest_at_service_start')  # Envía también el resumen al abrir cada servicio
+    last_digest_at = models.DateTimeField(blank=True, null=True, db_column='last_digest_at')
+    data_version = models.PositiveBigIntegerField(default=0, db_column='data_version')  # Aumenta con cada cambio en las reservas de la sede
+    data_modified = models.DateTimeField(blank=True, null=True, db_column='data_modified')  # Último cambio en las reservas de la sede
+    modification_date = models.DateTimeField(auto_now=True, db_column='modification_date')
 
     def __str__(self):
         return self.name
@@ -23,13 +38,178 @@ class Booking(models.Model):
     people_amount = models.IntegerField(db_column='people_amount')
     booking_date = models.DateField(db_column='booking_date')
     booking_hour = models.TimeField(db_column='booking_hour')
+    booking_slot = models.SmallIntegerField(editable=False, db_column='booking_slot')  # Franja de 15 minutos de booking_hour
     observations = models.TextField(blank=True, null=True, db_column='observations')
     active = models.BooleanField(default=True, db_column='active')
     approved = models.BooleanField(default=False, db_column='approved')
     creation_date = models.DateTimeField(auto_now_add=True, db_column='creation_date')
+    reminder_sent_at = models.DateTimeField(blank=True, null=True, db_column='reminder_sent_at')
+
+    def save(self, *args, **kwargs):
+        self.booking_slot = slot_de_hora(self.booking_hour)
+        super().save(*args, **kwargs)
     
     class Meta:
         db_table = 'Booking'
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
+        indexes = [
+            # Reservas activas de una sede por fecha y franja (cupos, pendientes)
+            models.Index(fields=['campus_id', 'booking_date', 'booking_slot'], condition=models.Q(active=True), name='booking_campus_active_idx'),
+            # Listado de una sede desde una fecha, en el orden en que se muestra
+            models.Index(fields=['campus_id', 'booking_date', 'booking_slot', 'booking_id'], name='booking_campus_date_idx'),
+            # Reservas activas de una persona
+            models.Index(fields=['person_id', 'booking_date'], condition=models.Q(active=True), name='booking_person_active_idx'),
+            # Reservas activas que aún no tienen recordatorio
+            models.Index(fields=['booking_date', 'booking_slot'], condition=models.Q(active=True, reminder_sent_at__isnull=True), name='booking_reminder_pending_idx'),
+        ]
+
+
+
+class CampusSchedule(models.Model):
+    REGULAR = 'REGULAR'
+    HOLIDAY = 'HOLIDAY'
+    HOLIDAY_EVE = 'HOLIDAY_EVE'
+    DAY_TYPE_CHOICES = [
+        (REGULAR, 'Día regular'),
+        (HOLIDAY, 'Festivo'),
+        (HOLIDAY_EVE, 'Víspera de festivo'),
+    ]
+    WEEKDAY_CHOICES = [
+        (0, 'Lunes'),
+        (1, 'Martes'),
+        (2, 'Miércoles'),
+        (3, 'Jueves'),
+        (4, 'Viernes'),
+        (5, 'Sábado'),
+        (6, 'Domingo'),
+    ]
+
+    schedule_id = models.AutoField(primary_key=True, db_column='schedule_id')
+    campus_id = models.ForeignKey(Campus, on_delete=models.CASCADE, db_column='campus_id')
+    day_type = models.CharField(max_length=11, choices=DAY_TYPE_CHOICES, default=REGULAR, db_column='day_type')
+    weekday = models.SmallIntegerField(choices=WEEKDAY_CHOICES, blank=True, null=True, db_column='weekday')  # Vacío aplica a todos los días
+    start_time = models.TimeField(db_column='start_time')
+    end_time = models.TimeField(db_column='end_time')  # No incluida
+
+    def __str__(self):
+        return f'{self.campus_id} {self.day_type} {self.start_time}-{self.end_time}'
+
+    class Meta:
+        db_table = 'CampusSchedule'
+        verbose_name = 'Campus Schedule'
+        verbose_name_plural = 'Campus Schedules'
+
+
+class ClosureDate(models.Model):
+    closure_id = models.AutoField(primary_key=True, db_column='closure_id')
+    closure_date = models.DateField(db_column='closure_date')
+    every_year = models.BooleanField(default=False, db_column='every_year')  # Se repite cada año en el mismo día y mes
+    description = models.CharField(max_length=150, blank=True, null=True, db_column='description')
+
+    def __str__(self):
+        return self.closure_date.strftime('%m-%d') if self.every_year else str(self.closure_date)
+
+    class Meta:
+        db_table = 'ClosureDate'
+        verbose_name = 'Closure Date'
+        verbose_name_plural = 'Closure Dates'
+
+
+class SlotOccupancy(models.Model):
+    occupancy_id = models.AutoField(primary_key=True, db_column='occupancy_id')
+    campus_id = models.ForeignKey(Campus, on_delete=models.CASCADE, db_column='campus_id')
+    occupancy_date = models.DateField(db_column='occupancy_date')
+    slot = models.SmallIntegerField(db_column='slot')  # Franja de 15 minutos, igual a Booking.booking_slot
+    people_total = models.IntegerField(default=0, db_column='people_total')  # Personas de las reservas activas en la franja
+
+    class Meta:
+        db_table = 'SlotOccupancy'
+        verbose_name = 'Slot Occupancy'
+        verbose_name_plural = 'Slot Occupancies'
+        unique_together = ('campus_id', 'occupancy_date', 'slot')
+
 
+class EmailOutbox(models.Model):
+    BOOKING_CUSTOMER = 'BOOKING_CUSTOMER'
+    BOOKING_CAMPUS = 'BOOKING_CAMPUS'
+    CAMPUS_DIGEST = 'CAMPUS_DIGEST'
+    KIND_CHOICES = [
+        (BOOKING_CUSTOMER, 'Booking customer'),
+        (BOOKING_CAMPUS, 'Booking campus'),
+        (CAMPUS_DIGEST, 'Campus digest'),
+    ]
+
+    PENDING = 'PENDING'
+    SENT = 'SENT'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    outbox_id = models.AutoField(primary_key=True, db_column='outbox_id')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES, db_column='kind')
+    payload = models.JSONField(db_column='payload')  # Argumentos de la función de envío del tipo de correo
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, db_column='status')
+    attempts = models.IntegerField(default=0, db_column='attempts')
+    next_attempt_at = models.DateTimeField(db_column='next_attempt_at')
+    last_error = models.TextField(blank=True, null=True, db_column='last_error')
+    creation_date = models.DateTimeField(auto_now_add=True, db_column='creation_date')
+    sent_date = models.DateTimeField(blank=True, null=True, db_column='sent_date')
+
+    def __str__(self):
+        return f'{self.kind} ({self.status})'
+
+    class Meta:
+        db_table = 'EmailOutbox'
+        verbose_name = 'Email Outbox'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['next_attempt_at'], name='outbox_pending_idx', condition=models.Q(status='PENDING')),
+        ]
+
+
+class CampusDigestEvent(models.Model):
+    event_id = models.AutoField(primary_key=True, db_column='event_id')
+    campus_id = models.ForeignKey(Campus, on_delete=models.CASCADE, db_column='campus_id')
+    booking_id = models.ForeignKey(Booking, on_delete=models.CASCADE, db_column='booking_id')
+    booking_status = models.CharField(max_length=20, db_column='booking_status')  # 'confirmada' o 'cancelada'
+    payload = models.JSONField(db_column='payload')  # Datos de la reserva para el resumen
+    creation_date = models.DateTimeField(auto_now_add=True, db_column='creation_date')
+    digest_sent_at = models.DateTimeField(blank=True, null=True, db_column='digest_sent_at')
+
+    def __str__(self):
+        return f'{self.campus_id} - {self.booking_status}'
+
+    class Meta:
+        db_table = 'CampusDigestEvent'
+        verbose_name = 'Campus Digest Event'
+        verbose_name_plural = 'Campus Digest Events'
+        indexes = [
+            models.Index(fields=['campus_id', 'creation_date'], name='digest_event_pending_idx', condition=models.Q(digest_sent_at__isnull=True)),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    idempotency_id = models.AutoField(primary_key=True, db_column='idempotency_id')
+    key = models.CharField(max_length=255, db_column='key')  # Valor del encabezado Idempotency-Key
+    endpoint = models.CharField(max_length=100, db_column='endpoint')
+    request_hash = models.CharField(max_length=64, db_column='request_hash')  # SHA-256 del cuerpo de la petición
+    status_code = models.SmallIntegerField(blank=True, null=True, db_column='status_code')
+    response_body = models.JSONField(blank=True, null=True, db_column='response_body')
+    creation_date = models.DateTimeField(auto_now_add=True, db_column='creation_date')
+    expires_at = models.DateTimeField(db_column='expires_at')
+
+    def __str__(self):
+        return f'{self.endpoint} - {self.key}'
+
+    class Meta:
+        db_table = 'IdempotencyKey'
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        unique_together = ('key', 'endpoint')
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
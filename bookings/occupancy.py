@@ -0,0 +1,115 @@
+from datetime import datetime
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from bookings.models import Booking, SlotOccupancy
+import bookings.availability as availability
+import bookings.events as events
+
+
+def registrar_ocupacion(sede_id, fecha_reserva, slot, personas):
+    """
+    Suma (o resta, si es negativo) personas a la ocupación de una franja.
+    Debe llamarse dentro de la misma transacción que guarda la reserva.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    :param slot: Franja de 15 minutos de la reserva (int).
+    :param personas: Personas a sumar o restar (int).
+    """
+    if connection.vendor in ('postgresql', 'sqlite'):
+        # Una sola sentencia crea la franja o suma sobre la existente
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO "SlotOccupancy" (campus_id, occupancy_date, slot, people_total) VALUES (%s, %s, %s, %s) '
+                'ON CONFLICT (campus_id, occupancy_date, slot) DO UPDATE SET people_total = "SlotOccupancy".people_total + EXCLUDED.people_total',
+                [int(sede_id), fecha_reserva, slot, personas],
+            )
+    else:
+        ocupacion, _ = SlotOccupancy.objects.get_or_create(campus_id_id=sede_id, occupancy_date=fecha_reserva, slot=slot)
+        SlotOccupancy.objects.filter(pk=ocupacion.pk).update(people_total=F('people_total') + personas)
+    availability.invalidar_ocupacion(sede_id, fecha_reserva)
+    events.notificar(sede_id, fecha_reserva, 'availability', slot=slot, people_delta=personas)
+
+
+def bloquear_capacidad(sede_id, fecha_reserva):
+    """
+    Bloquea el cupo de una sede en una fecha hasta que termine la transacción
+    en curso. Solo espera quien reserva en la misma sede y fecha; las demás
+    combinaciones no se bloquean entre sí.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    """
+    if connection.vendor != 'postgresql':
+        return
+
+    if isinstance(fecha_reserva, str):
+        fecha_reserva = datetime.strptime(fecha_reserva, "%Y-%m-%d").date()
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [int(sede_id), fecha_reserva.toordinal()])
+
+
+def hay_capacidad(sede_id, fecha_reserva, slot, personas):
+    """
+    Verifica que la franja admita las personas. Para que la verificación y la
+    inserción sean atómicas, llamar dentro de la transacción que crea la
+    reserva y después de bloquear_capacidad.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    :param slot: Franja de 15 minutos de la reserva (int).
+    :param personas: Personas de la nueva reserva (int).
+    :return: True si hay cupo, False en caso contrario.
+    """
+    return ocupacion_en_ventana(sede_id, fecha_reserva, slot) + personas <= availability.CAPACIDAD_MAXIMA
+
+
+def ocupacion_en_ventana(sede_id, fecha_reserva, slot):
+    """
+    Suma las personas de las franjas dentro de la ventana de ocupación del slot.
+
+    :param sede_id: ID de la sede (int).
+    :param fecha_reserva: Fecha de la reserva (date o str, formato YYYY-MM-DD).
+    :param slot: Franja de 15 minutos a consultar (int).
+    :return: Personas ocupando la ventana (int).
+    """
+    return SlotOccupancy.objects.filter(
+        campus_id=sede_id,
+        occupancy_date=fecha_reserva,
+        slot__range=(slot - availability.VENTANA_SLOTS, slot + availability.VENTANA_SLOTS),
+    ).aggregate(Sum('people_total'))['people_total__sum'] or 0
+
+
+def reconstruir_ocupacion(sede_id=None, fecha_desde=None, fecha_hasta=None):
+    """
+    Recalcula la tabla de ocupación a partir de las reservas activas.
+
+    :param sede_id: Limitar a una sede (int, opcional).
+    :param fecha_desde: Primera fecha a recalcular (date, opcional).
+    :param fecha_hasta: Última fecha a recalcular (date, opcional).
+    :return: Número de franjas con ocupación escritas (int).
+    """
+    ocupaciones = SlotOccupancy.objects.all()
+    reservas = Booking.objects.filter(active=True)
+    if sede_id is not None:
+        ocupaciones = ocupaciones.filter(campus_id=sede_id)
+        reservas = reservas.filter(campus_id=sede_id)
+    if fecha_desde is not None:
+        ocupaciones = ocupaciones.filter(occupancy_date__gte=fecha_desde)
+        reservas = reservas.filter(booking_date__gte=fecha_desde)
+    if fecha_hasta is not None:
+        ocupaciones = ocupaciones.filter(occupancy_date__lte=fecha_hasta)
+        reservas = reservas.filter(booking_date__lte=fecha_hasta)
+
+    totales = reservas.values('campus_id', 'booking_date', 'booking_slot').annotate(total=Sum('people_amount')).order_by()
+
+    with transaction.atomic():
+        ocupaciones.delete()
+        creadas = SlotOccupancy.objects.bulk_create([
+            SlotOccupancy(campus_id_id=fila['campus_id'], occupancy_date=fila['booking_date'], slot=fila['booking_slot'], people_total=fila['total'])
+            for fila in totales
+        ], batch_size=1000)
+        transaction.on_commit(availability.cache_ocupacion.limpiar)
+
+    return len(creadas)
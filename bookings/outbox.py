@@ -0,0 +1,164 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from bookings.models import Campus, CampusDigestEvent, EmailOutbox
+import bookings.catalog as catalog
+import bookings.digests as digests
+import bookings.utils as utils
+
+# Función de envío de cada tipo de correo; el payload son sus argumentos
+ENVIOS = {
+    EmailOutbox.BOOKING_CUSTOMER: utils.enviar_correo_confirmacion_reserva,
+    EmailOutbox.BOOKING_CAMPUS: utils.enviar_correo_confirmacion_reserva_sede,
+    EmailOutbox.CAMPUS_DIGEST: utils.enviar_correo_resumen_sede,
+}
+
+
+def encolar_correo(tipo, **datos):
+    """
+    Guarda un correo en la bandeja de salida. Llamado dentro de la transacción
+    de la reserva, el correo solo existe si la reserva se confirma.
+
+    :param tipo: Tipo de correo (EmailOutbox.KIND_CHOICES).
+    :param datos: Argumentos de la función de envío del tipo; deben ser serializables a JSON.
+    :return: Registro creado (EmailOutbox).
+    """
+    return EmailOutbox.objects.create(kind=tipo, payload=datos, next_attempt_at=timezone.now())
+
+
+def correos_reserva(booking_id, person, campus, fecha_reserva, hora_reserva, cantidad_personas, observaciones, estado_reserva):
+    """
+    Prepara, sin guardarlos, los correos de una reserva confirmada o cancelada:
+    uno para el cliente y otro para la sede. Si la sede recibe resúmenes, en
+    lugar del correo de la sede se prepara el evento para su próximo resumen.
+
+    :param booking_id: ID de la reserva (int).
+    :param person: Persona de la reserva (People).
+    :param campus: Sede de la reserva (Campus).
+    :param fecha_reserva: Fecha de la reserva (date o str).
+    :param hora_reserva: Hora de la reserva (time o str).
+    :param cantidad_personas: Número de personas (int).
+    :param observaciones: Observaciones de la reserva (str).
+    :param estado_reserva: 'confirmada' o 'cancelada' (str).
+    :return: Tupla (correos, eventos) con listas de EmailOutbox y CampusDigestEvent sin guardar.
+    """
+    nombre = f'{person.first_name} {person.first_last_name}'
+    observaciones = observaciones if observaciones else 'Sin observaciones'
+    ahora = timezone.now()
+
+    correos = [EmailOutbox(
+        kind=EmailOutbox.BOOKING_CUSTOMER, next_attempt_at=ahora,
+        payload=dict(
+            correo_destinatario=person.email, nombre_destinatario=nombre, fecha_reserva=str(fecha_reserva),
+            hora_reserva=str(hora_reserva)[:5], sede_reserva=campus.name, cantidad_personas=cantidad_personas,
+            observaciones=observaciones, estado_reserva=estado_reserva,
+        ),
+    )]
+    if campus.notification_mode == Campus.DIGEST:
+        evento = digests.nuevo_evento(
+            booking_id, campus, estado_reserva,
+            nombre_cliente=nombre, fecha_reserva=str(fecha_reserva), hora_reserva=str(hora_reserva)[:5],
+            cantidad_personas=cantidad_personas, celular=person.phone_number, observaciones=observaciones,
+        )
+        return correos, [evento]
+
+    correos.append(EmailOutbox(
+        kind=EmailOutbox.BOOKING_CAMPUS, next_attempt_at=ahora,
+        payload=dict(
+            correo_destinatario=campus.email, sede_reserva=campus.name, nombre_cliente=nombre, fecha_reserva=str(fecha_reserva),
+            hora_reserva=str(hora_reserva)[:5], cantidad_personas=cantidad_personas, celular=person.phone_number,
+            observaciones=observaciones, estado_reserva=estado_reserva,
+        ),
+    ))
+    return correos, []
+
+
+def encolar_correos_reserva(booking_id, person, campus, fecha_reserva, hora_reserva, cantidad_personas, observaciones, estado_reserva):
+    """
+    Encola los correos de una reserva confirmada o cancelada (ver
+    correos_reserva). Se llama dentro de la transacción de la reserva.
+    """
+    correos, eventos = correos_reserva(booking_id, person, campus, fecha_reserva, hora_reserva, cantidad_personas, observaciones, estado_reserva)
+    EmailOutbox.objects.bulk_create(correos)
+    CampusDigestEvent.objects.bulk_create(eventos)
+
+
+def encolar_correos_reservas(bookings, estado_reserva):
+    """
+    Encola los correos de varias reservas con una inserción por tabla en lugar
+    de dos por reserva. Se llama dentro de la transacción que las modifica.
+
+    :param bookings: Reservas con su persona cargada (iterable de Booking, usar select_related('person_id')).
+    :param estado_reserva: 'confirmada' o 'cancelada' (str).
+    :return: Correos encolados (int).
+    """
+    correos, eventos = [], []
+    for booking in bookings:
+        campus = catalog.obtener_sede(booking.campus_id_id)
+        correos_booking, eventos_booking = correos_reserva(
+            booking.booking_id, booking.person_id, campus, booking.booking_date, booking.booking_hour,
+            booking.people_amount, booking.observations, estado_reserva,
+        )
+        correos.extend(correos_booking)
+        eventos.extend(eventos_booking)
+
+    EmailOutbox.objects.bulk_create(correos)
+    CampusDigestEvent.objects.bulk_create(eventos)
+    return len(correos)
+
+
+def espera_reintento(intentos):
+    """
+    Calcula la espera antes del siguiente intento: EMAIL_OUTBOX_RETRY_SECONDS
+    duplicada por cada intento fallido.
+
+    :param intentos: Intentos fallidos hasta ahora (int).
+    :return: Espera (timedelta).
+    """
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (intentos - 1))
+
+
+def procesar_lote(tamano=None):
+    """
+    Envía un lote de correos pendientes cuyo intento ya venció. Los registros
+    se bloquean con SKIP LOCKED, así varios procesos pueden vaciar la bandeja
+    sin enviar dos veces el mismo correo.
+
+    :param tamano: Correos por lote (int); por defecto EMAIL_OUTBOX_BATCH_SIZE.
+    :return: Tupla (enviados, fallidos) del lote.
+    """
+    tamano = tamano or settings.EMAIL_OUTBOX_BATCH_SIZE
+    enviados = fallidos = 0
+
+    with transaction.atomic():
+        pendientes = (
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:tamano]
+        )
+        for correo in pendientes:
+            try:
+                # Sin fail_silently el error del servidor llega aquí y queda en last_error
+                enviado = ENVIOS[correo.kind](**correo.payload, fail_silently=False)
+                error = None if enviado else 'El servidor de correo rechazó el envío.'
+            except Exception as e:
+                enviado, error = False, str(e)
+
+            correo.attempts += 1
+            if enviado:
+                correo.status = EmailOutbox.SENT
+                correo.sent_date = timezone.now()
+                correo.last_error = None
+                enviados += 1
+            else:
+                correo.last_error = error
+                if correo.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    correo.status = EmailOutbox.FAILED
+                else:
+                    correo.next_attempt_at = timezone.now() + espera_reintento(correo.attempts)
+                fallidos += 1
+            correo.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_date'])
+
+    return enviados, fallidos
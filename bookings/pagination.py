@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import date, time
+from django.db.models import Q
+from bookings.slots import slot_de_hora
+
+
+def codificar_cursor(booking):
+    """
+    Codifica la posición de una reserva en el listado como cursor opaco.
+
+    :param booking: Última reserva de la página (Booking).
+    :return: Cursor (str, base64 url-safe).
+    """
+    posicion = [booking.booking_date.isoformat(), booking.booking_hour.isoformat(), booking.booking_id]
+    return base64.urlsafe_b64encode(json.dumps(posicion, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """
+    Decodifica un cursor generado por codificar_cursor.
+
+    :param cursor: Cursor (str).
+    :return: Tupla (booking_date, booking_hour, booking_id).
+    :raises ValueError: Si el cursor no es válido.
+    """
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        fecha, hora, booking_id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return date.fromisoformat(fecha), time.fromisoformat(hora), int(booking_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("El cursor no es válido.")
+
+
+def filtro_despues_de(cursor):
+    """
+    Construye el filtro de las reservas posteriores al cursor en el orden
+    (booking_date, booking_slot, booking_hour, booking_id). La franja se
+    deriva de la hora y permite usar el índice de listado de la sede.
+
+    :param cursor: Cursor (str).
+    :return: Filtro (Q).
+    :raises ValueError: Si el cursor no es válido.
+    """
+    fecha, hora, booking_id = decodificar_cursor(cursor)
+    slot = slot_de_hora(hora.strftime('%H:%M'))
+    return (
+        Q(booking_date__gt=fecha)
+        | Q(booking_date=fecha, booking_slot__gt=slot)
+        | Q(booking_date=fecha, booking_slot=slot, booking_hour__gt=hora)
+        | Q(booking_date=fecha, booking_slot=slot, booking_hour=hora, booking_id__gt=booking_id)
+    )
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from bookings.models import Booking
+from bookings.slots import slot_de_hora
+import bookings.emails as emails
+import bookings.mailing as mailing
+
+
+def filtro_ventana(desde, hasta):
+    """
+    Construye el filtro de las reservas entre dos momentos, sobre fecha y
+    franja, para que la consulta use booking_reminder_pending_idx.
+
+    :param desde: Inicio de la ventana (datetime con zona horaria).
+    :param hasta: Fin de la ventana (datetime con zona horaria).
+    :return: Filtro (Q).
+    """
+    desde, hasta = timezone.localtime(desde), timezone.localtime(hasta)
+    slot_desde = slot_de_hora(desde.strftime('%H:%M'))
+    slot_hasta = slot_de_hora(hasta.strftime('%H:%M'))
+
+    if desde.date() == hasta.date():
+        return Q(booking_date=desde.date(), booking_slot__range=(slot_desde, slot_hasta))
+
+    return (
+        Q(booking_date=desde.date(), booking_slot__gte=slot_desde)
+        | Q(booking_date__gt=desde.date(), booking_date__lt=hasta.date())
+        | Q(booking_date=hasta.date(), booking_slot__lte=slot_hasta)
+    )
+
+
+def reservas_por_recordar(desde, hasta):
+    """
+    Consulta las reservas activas de la ventana que aún no tienen
+    recordatorio, de personas que aceptan correos.
+
+    :param desde: Inicio de la ventana (datetime con zona horaria).
+    :param hasta: Fin de la ventana (datetime con zona horaria).
+    :return: Reservas con su persona y sede (QuerySet de Booking).
+    """
+    return (
+        Booking.objects
+        .filter(filtro_ventana(desde, hasta), active=True, reminder_sent_at__isnull=True, person_id__send_email=True)
+        .select_related('person_id', 'campus_id')
+        .order_by('booking_date', 'booking_slot', 'booking_id')
+    )
+
+
+def reclamar_lote(desde, hasta, tamano):
+    """
+    Marca como recordado un lote de reservas y lo devuelve. Las filas se
+    bloquean con SKIP LOCKED y la marca se guarda antes de enviar, así dos
+    ejecuciones simultáneas nunca recuerdan la misma reserva.
+
+    :param desde: Inicio de la ventana (datetime con zona horaria).
+    :param hasta: Fin de la ventana (datetime con zona horaria).
+    :param tamano: Reservas por lote (int).
+    :return: Tupla (reservas reclamadas, marca de tiempo usada).
+    """
+    marca = timezone.now()
+    with transaction.atomic():
+        reservas = list(reservas_por_recordar(desde, hasta).select_for_update(skip_locked=True, of=('self',))[:tamano])
+        if reservas:
+            Booking.objects.filter(booking_id__in=[reserva.booking_id for reserva in reservas]).update(reminder_sent_at=marca)
+    return reservas, marca
+
+
+def construir_recordatorios(reservas):
+    """
+    Arma un correo de recordatorio por persona con todas sus reservas del lote.
+
+    :param reservas: Reservas con su persona y sede (lista de Booking).
+    :return: Lista de tuplas (correo listo para enviar, reservas que recuerda).
+    """
+    por_persona = {}
+    for reserva in reservas:
+        por_persona.setdefault(reserva.person_id.email, []).append(reserva)
+
+    correos = []
+    for correo_destinatario, reservas_persona in por_persona.items():
+        persona = reservas_persona[0].person_id
+        contexto = {
+            'saludo': f'{persona.first_name} {persona.first_last_name}',
+            'detalles': [
+                (
+                    f'{reserva.booking_date} {reserva.booking_hour.strftime("%H:%M")}',
+                    f'{reserva.campus_id.name}, {reserva.people_amount} personas',
+                )
+                for reserva in reservas_persona
+            ],
+        }
+        correo = emails.construir_correo('recordatorio_reserva', 'Recordatorio de tu reserva en Limoncello', correo_destinatario, contexto)
+        correos.append((correo, reservas_persona))
+    return correos
+
+
+def enviar_recordatorios(horas_antes=None, tamano=None, ahora=None):
+    """
+    Envía los recordatorios de las reservas de las próximas horas, por lotes y
+    un correo a la vez por la conexión SMTP compartida. Cada reserva enviada
+    conserva su marca. Si el servidor rechaza un correo de forma definitiva,
+    sus reservas también la conservan y se reportan como error, para que no
+    se reclamen en cada ejecución. Ante otro error se liberan solo las
+    reservas aún sin enviar, para reintentarse en la siguiente ejecución.
+
+    :param horas_antes: Horas de anticipación (int); por defecto BOOKING_REMINDER_HOURS_BEFORE.
+    :param tamano: Reservas por lote (int); por defecto BOOKING_REMINDER_BATCH_SIZE.
+    :param ahora: Inicio de la ventana (datetime con zona horaria); por defecto ahora.
+    :return: Tupla (reservas recordadas, correos enviados, reservas liberadas,
+        errores como lista de tuplas (IDs de las reservas, mensaje)).
+    """
+    horas_antes = horas_antes or settings.BOOKING_REMINDER_HOURS_BEFORE
+    tamano = tamano or settings.BOOKING_REMINDER_BATCH_SIZE
+    desde = ahora or timezone.now()
+    hasta = desde + timedelta(hours=horas_antes)
+
+    recordadas = enviados = liberadas = 0
+    errores = []
+    while True:
+        reservas, marca = reclamar_lote(desde, hasta, tamano)
+        if not reservas:
+            break
+
+        correos = construir_recordatorios(reservas)
+        for posicion, (correo, reservas_persona) in enumerate(correos):
+            try:
+                mailing.enviar_mensaje(correo)
+            except Exception as e:
+                errores.append(([reserva.booking_id for reserva in reservas_persona], str(e)))
+                if mailing.es_rechazo_permanente(e):
+                    continue
+                # Se liberan las reservas de este correo y de los que no se intentaron
+                pendientes = [reserva.booking_id for _, resto in correos[posicion:] for reserva in resto]
+                liberadas += Booking.objects.filter(booking_id__in=pendientes, reminder_sent_at=marca).update(reminder_sent_at=None)
+                return recordadas, enviados, liberadas, errores
+            enviados += 1
+            recordadas += len(reservas_persona)
+
+    return recordadas, enviados, liberadas, errores
@@ -0,0 +1,153 @@
+import threading
+import time
+from datetime import timedelta
+import holidays
+from django.conf import settings
+from bookings.models import CampusSchedule, ClosureDate
+
+# Texto HH:MM de cada minuto del día, para no formatear horas en cada consulta
+HORAS_TEXTO = tuple(f'{minuto // 60:02d}:{minuto % 60:02d}' for minuto in range(24 * 60))
+
+INTERVALO_MINUTOS = 15
+
+# Tipos de día del índice de fechas especiales
+DIA_REGULAR = 'REGULAR'
+DIA_FESTIVO = 'HOLIDAY'
+DIA_VISPERA_FESTIVO = 'HOLIDAY_EVE'
+DIA_CERRADO = 'CLOSED'
+
+_tablas = None
+_compiladas_en = 0.0
+_indices_dias = {}
+_lock = threading.Lock()
+
+
+def _minutos(hora):
+    return hora.hour * 60 + hora.minute + (1 if hora.second else 0)
+
+
+def compilar_horarios():
+    """
+    Compila los horarios de todas las sedes en tablas de minutos.
+
+    :return: Diccionario campus_id -> {(day_type, weekday): tupla de minutos del día}.
+    """
+    minutos_por_dia = {}
+    horarios = CampusSchedule.objects.values_list('campus_id', 'day_type', 'weekday', 'start_time', 'end_time')
+    for campus_id, day_type, weekday, inicio, fin in horarios:
+        dias = range(7) if weekday is None else [weekday]
+        for dia in dias:
+            minutos = minutos_por_dia.setdefault(campus_id, {}).setdefault((day_type, dia), set())
+            minutos.update(range(_minutos(inicio), _minutos(fin), INTERVALO_MINUTOS))
+
+    return {
+        campus_id: {clave: tuple(sorted(minutos)) for clave, minutos in tabla.items()}
+        for campus_id, tabla in minutos_por_dia.items()
+    }
+
+
+def obtener_tablas():
+    """
+    Devuelve las tablas compiladas, compilándolas si aún no existen en este
+    proceso o si superaron SCHEDULE_CACHE_MAX_AGE (cambios hechos desde otro proceso).
+    """
+    global _tablas, _compiladas_en
+    with _lock:
+        if _tablas is None or time.monotonic() - _compiladas_en > settings.SCHEDULE_CACHE_MAX_AGE:
+            _tablas = compilar_horarios()
+            _compiladas_en = time.monotonic()
+        return _tablas
+
+
+def invalidar_horarios(**kwargs):
+    global _tablas
+    with _lock:
+        _tablas = None
+
+
+def construir_indice_dias(year):
+    """
+    Construye el índice de fechas especiales de un año: cierres, festivos de
+    Colombia y vísperas de festivo. Los días regulares no se guardan.
+
+    :param year: Año del índice (int).
+    :return: Diccionario date -> tipo de día (str).
+    """
+    festivos = holidays.Colombia(years=[year, year + 1])
+    indice = {}
+
+    # Un día cuyo siguiente es festivo es víspera, incluido el 31 de diciembre
+    for festivo in festivos:
+        vispera = festivo - timedelta(days=1)
+        if vispera.year == year:
+            indice[vispera] = DIA_VISPERA_FESTIVO
+
+    for festivo in festivos:
+        if festivo.year == year:
+            indice[festivo] = DIA_FESTIVO
+
+    for fecha, every_year in ClosureDate.objects.values_list('closure_date', 'every_year'):
+        if every_year:
+            try:
+                fecha = fecha.replace(year=year)
+            except ValueError:  # 29 de febrero en un año no bisiesto
+                continue
+        if fecha.year == year:
+            indice[fecha] = DIA_CERRADO
+
+    return indice
+
+
+def tipo_de_dia(fecha):
+    """
+    Clasifica una fecha como cerrada, festiva, víspera de festivo o regular.
+    El índice de cada año se construye la primera vez que se consulta y se
+    comparte entre todas las búsquedas de horarios del proceso.
+
+    :param fecha: Fecha a clasificar (date).
+    :return: Tipo de día (str).
+    """
+    with _lock:
+        indice = _indices_dias.get(fecha.year)
+        if indice is None or time.monotonic() - indice[0] > settings.SCHEDULE_CACHE_MAX_AGE:
+            indice = (time.monotonic(), construir_indice_dias(fecha.year))
+            _indices_dias[fecha.year] = indice
+    return indice[1].get(fecha, DIA_REGULAR)
+
+
+def invalidar_dias(**kwargs):
+    with _lock:
+        _indices_dias.clear()
+
+
+def minutos_de_atencion(sede_id, dia_semana, tipo_dia):
+    """
+    Obtiene los minutos del día en que la sede recibe reservas.
+
+    Un festivo usa las reglas HOLIDAY de la sede y una víspera de festivo las
+    HOLIDAY_EVE de ese día de la semana; si la sede no las tiene se usan las
+    reglas REGULAR del día. Un día cerrado no tiene horarios.
+
+    :param sede_id: ID de la sede (int).
+    :param dia_semana: Día de la semana (int, 0 = lunes).
+    :param tipo_dia: Tipo de día según tipo_de_dia (str).
+    :return: Tupla de minutos del día (int).
+    :raises ValueError: Si la sede no tiene horarios configurados.
+    """
+    if tipo_dia == DIA_CERRADO:
+        return ()
+
+    tabla = obtener_tablas().get(int(sede_id))
+    if tabla is None:
+        raise ValueError(f"La sede con ID {sede_id} no está configurada.")
+
+    minutos = None
+    if tipo_dia == DIA_FESTIVO:
+        minutos = tabla.get((CampusSchedule.HOLIDAY, dia_semana))
+    elif tipo_dia == DIA_VISPERA_FESTIVO:
+        minutos = tabla.get((CampusSchedule.HOLIDAY_EVE, dia_semana))
+
+    if minutos is None:
+        minutos = tabla.get((CampusSchedule.REGULAR, dia_semana), ())
+
+    return minutos
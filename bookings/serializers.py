@@ -1,11 +1,11 @@
 from rest_framework import serializers
 from bookings.models import Campus, Booking
-from users.models import People
 
 class CampusSerializer(serializers.ModelSerializer):
     class Meta:
         model = Campus
-        fields = '__all__'
+        # Columnas internas de la caché y de los resúmenes, fuera del contrato de la API
+        exclude = ['last_digest_at', 'data_version', 'data_modified']
 
 
 class CampusSerializerDetail(serializers.ModelSerializer):
@@ -23,7 +23,8 @@ class CampusSerializerList(serializers.ModelSerializer):
 class BookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Booking
-        fields = '__all__'
+        # Columnas internas de la ocupación y de los recordatorios, fuera del contrato de la API
+        exclude = ['booking_slot', 'reminder_sent_at']
 
 
 class BookingListSerializer(serializers.ModelSerializer):
@@ -36,7 +37,7 @@ class BookingListSerializer(serializers.ModelSerializer):
         fields = ['booking_id', 'campus_id', 'person_id', 'name_person', 'booking_date', 'booking_hour', 'phone_person', 'people_amount', 'state']
     
     def get_name_person(self, obj):
-        person = People.objects.get(person_id=obj.person_id.person_id)
+        person = obj.person_id
         return person.first_name + ' ' + person.first_last_name
     
     def get_state(self, obj):
@@ -60,7 +61,7 @@ class BookingByIdSerializer(serializers.ModelSerializer):
         fields = ['booking_id', 'campus_id', 'person_id', 'name_person', 'phone_person', 'email_person', 'booking_date', 'booking_hour', 'people_amount', 'observations', 'creation_date', 'state']
     
     def get_name_person(self, obj):
-        person = People.objects.get(person_id=obj.person_id.person_id)
+        person = obj.person_id
         full_name = ' '.join(filter(None, [person.first_name, person.second_name, person.first_last_name, person.second_last_name]))
         return full_name
     
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from bookings.models import Campus, CampusSchedule, ClosureDate
+from users.models import People
+import bookings.schedules as schedules
+import bookings.catalog as catalog
+import bookings.conditional as conditional
+
+# Recompilar las tablas de horarios cuando cambian en este proceso
+post_save.connect(schedules.invalidar_horarios, sender=CampusSchedule, dispatch_uid='campus_schedule_saved')
+post_delete.connect(schedules.invalidar_horarios, sender=CampusSchedule, dispatch_uid='campus_schedule_deleted')
+
+# Reconstruir el índice de fechas especiales cuando cambian los cierres
+post_save.connect(schedules.invalidar_dias, sender=ClosureDate, dispatch_uid='closure_date_saved')
+post_delete.connect(schedules.invalidar_dias, sender=ClosureDate, dispatch_uid='closure_date_deleted')
+
+# Recargar el catálogo de sedes cuando cambia una sede
+post_save.connect(catalog.invalidar_catalogo, sender=Campus, dispatch_uid='campus_saved')
+post_delete.connect(catalog.invalidar_catalogo, sender=Campus, dispatch_uid='campus_deleted')
+
+# Los listados de reservas muestran datos de la persona: su ETag cambia cuando se edita
+post_save.connect(conditional.registrar_cambio_persona, sender=People, dispatch_uid='people_saved')
+pre_delete.connect(conditional.registrar_cambio_persona, sender=People, dispatch_uid='people_deleting')
@@ -0,0 +1,25 @@
+from datetime import time
+
+# La jornada se divide en franjas de 15 minutos: franja = minutos desde la medianoche // 15
+MINUTOS_POR_SLOT = 15
+SLOTS_POR_DIA = 24 * 60 // MINUTOS_POR_SLOT
+
+# Hora HH:MM y etiqueta AM/PM de cada franja, calculadas una sola vez
+HORAS_24 = tuple(time(slot // 4, slot % 4 * MINUTOS_POR_SLOT).strftime("%H:%M") for slot in range(SLOTS_POR_DIA))
+ETIQUETAS_AM_PM = tuple(time(slot // 4, slot % 4 * MINUTOS_POR_SLOT).strftime("%I:%M %p") for slot in range(SLOTS_POR_DIA))
+
+AM_PM_DE_HORA = dict(zip(HORAS_24, ETIQUETAS_AM_PM))
+HORA_DE_AM_PM = dict(zip(ETIQUETAS_AM_PM, HORAS_24))
+
+
+def slot_de_hora(hora):
+    """
+    Obtiene la franja de 15 minutos a la que pertenece una hora.
+
+    :param hora: Hora (time o str, formato HH:MM o HH:MM:SS).
+    :return: Número de franja entre 0 y 95 (int).
+    """
+    if isinstance(hora, str):
+        horas, minutos = hora.split(':')[:2]
+        return (int(horas) * 60 + int(minutos)) // MINUTOS_POR_SLOT
+    return (hora.hour * 60 + hora.minute) // MINUTOS_POR_SLOT
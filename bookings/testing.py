@@ -0,0 +1,92 @@
+import socketserver
+import threading
+import time
+
+# Dobles en proceso de servicios externos, para las pruebas y los benchmarks
+
+
+class ServidorSMTPLocal(socketserver.ThreadingTCPServer):
+    """
+    Servidor SMTP mínimo en memoria: acepta cualquier mensaje y lo guarda.
+    Simula la latencia del saludo de un servidor real y permite cortar las
+    conexiones abiertas, o la siguiente tras recibir cortar_despues_de
+    mensajes, para probar la reconexión. Los destinatarios de rechazar
+    (correo -> código) se rechazan con ese código.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, espera_saludo):
+        super().__init__(('127.0.0.1', 0), ManejadorSMTP)
+        self.espera_saludo = espera_saludo
+        self.mensajes = []
+        self.conexiones = 0
+        self.cortar_despues_de = None
+        self.rechazar = {}
+        self.sockets = set()
+        self.lock = threading.Lock()
+
+    def cortar_conexiones(self):
+        with self.lock:
+            for sock in list(self.sockets):
+                try:
+                    sock.shutdown(2)
+                except OSError:
+                    pass
+
+
+class ManejadorSMTP(socketserver.StreamRequestHandler):
+
+    def responder(self, linea):
+        self.wfile.write(linea.encode() + b'\r\n')
+
+    def handle(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.conexiones += 1
+            servidor.sockets.add(self.connection)
+        try:
+            time.sleep(servidor.espera_saludo)
+            self.responder('220 localhost SMTP')
+            while True:
+                linea = self.rfile.readline()
+                if not linea:
+                    return
+                comando = linea.decode(errors='replace').strip().upper()
+                if comando.startswith(('EHLO', 'HELO')):
+                    time.sleep(servidor.espera_saludo)
+                    self.responder('250-localhost')
+                    self.responder('250 8BITMIME')
+                elif comando.startswith('MAIL'):
+                    with servidor.lock:
+                        cortar = servidor.cortar_despues_de is not None and len(servidor.mensajes) >= servidor.cortar_despues_de
+                        if cortar:
+                            servidor.cortar_despues_de = None
+                    if cortar:
+                        return
+                    self.responder('250 OK')
+                elif comando.startswith('RCPT'):
+                    correo = comando.partition('<')[2].partition('>')[0]
+                    codigo = {destinatario.upper(): codigo for destinatario, codigo in servidor.rechazar.items()}.get(correo)
+                    self.responder(f'{codigo} Recipient rejected' if codigo else '250 OK')
+                elif comando.startswith('DATA'):
+                    self.responder('354 End data with <CR><LF>.<CR><LF>')
+                    datos = []
+                    while True:
+                        linea = self.rfile.readline()
+                        if not linea or linea in (b'.\r\n', b'.\n'):
+                            break
+                        datos.append(linea)
+                    with servidor.lock:
+                        servidor.mensajes.append(b''.join(datos))
+                    self.responder('250 OK')
+                elif comando.startswith('QUIT'):
+                    self.responder('221 Bye')
+                    return
+                else:  # RSET, NOOP
+                    self.responder('250 OK')
+        except OSError:
+            return
+        finally:
+            with servidor.lock:
+                servidor.sockets.discard(self.connection)
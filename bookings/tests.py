@@ -0,0 +1,861 @@
+import asyncio
+import sys
+import threading
+from asgiref.sync import sync_to_async
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from unittest import mock, skipUnless
+from django.db import OperationalError, connection, transaction
+from django.db.models import Sum
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from bookings.availability import CAPACIDAD_MAXIMA
+from bookings.cache import CacheLRU
+from bookings.models import Booking, Campus, CampusDigestEvent, CampusSchedule, EmailOutbox, IdempotencyKey, SlotOccupancy
+from bookings.testing import ServidorSMTPLocal
+from users.models import People
+import bookings.availability as availability
+import bookings.catalog as catalog
+import bookings.details as details
+import bookings.digests as digests
+import bookings.events as events
+import bookings.imports as imports
+import bookings.mailing as mailing
+import bookings.occupancy as occupancy
+import bookings.outbox as outbox
+import bookings.reminders as reminders
+import bookings.schedules as schedules
+
+
+def limpiar_caches():
+    """
+    Vacía los caches del proceso, así cada prueba empieza sin datos de otra.
+    """
+    catalog.invalidar_catalogo()
+    schedules.invalidar_horarios()
+    schedules.invalidar_dias()
+    availability.cache_ocupacion.limpiar()
+    details.cache_reservas.limpiar()
+
+
+class ReservasTestCase(TestCase):
+    """
+    Una sede que atiende todos los días de 12:00 a 22:00 y una persona.
+    """
+    fecha = date(2099, 3, 3)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = Campus.objects.create(name='Sede 1', address='Calle 1', phone='3000000000', email='sede1@example.com')
+        CampusSchedule.objects.create(campus_id=cls.campus, start_time=time(12, 0), end_time=time(22, 0))
+        cls.person = People.objects.create(
+            identification='1000000000', first_name='ANA', first_last_name='PEREZ',
+            date_of_birth=date(1990, 1, 1), phone_number='3001234567', email='ANA@EXAMPLE.COM',
+        )
+
+    def setUp(self):
+        limpiar_caches()
+        self.client = APIClient()
+
+    def reservar(self, hora, personas, fecha=None, person=None):
+        """
+        Crea una reserva activa y suma su ocupación, como create-booking/.
+        """
+        booking = Booking.objects.create(
+            person_id=person or self.person, campus_id=self.campus, people_amount=personas,
+            booking_date=fecha or self.fecha, booking_hour=hora,
+        )
+        occupancy.registrar_ocupacion(self.campus.campus_id, booking.booking_date, booking.booking_slot, personas)
+        return booking
+
+
+class HorariosPermitidosTests(ReservasTestCase):
+
+    def listar_horas(self, people_amount=2):
+        return self.client.get('/api/bookings/list-hours/', {
+            'campus_id': self.campus.campus_id, 'booking_date': self.fecha.isoformat(), 'people_amount': people_amount,
+        })
+
+    def test_consultas_no_crecen_con_las_reservas(self):
+        # Sin cache: catálogo, horarios, cierres y ocupación del día
+        for cantidad in (1, 40):
+            for indice in range(cantidad):
+                self.reservar(time(12 + indice % 10, 15 * (indice % 4)), 1)
+            limpiar_caches()
+            with self.assertNumQueries(4):
+                response = self.listar_horas()
+            self.assertEqual(response.status_code, 200)
+
+        # Con cache no se consulta la base
+        with self.assertNumQueries(0):
+            self.assertEqual(self.listar_horas().data, response.data)
+
+    def test_excluye_horarios_sin_cupo_en_la_ventana(self):
+        self.reservar(time(19, 0), 30)
+
+        horas = self.listar_horas(people_amount=1).data['data']
+
+        # 89 minutos a cada lado de las 19:00 no queda cupo
+        self.assertIn('05:30 PM', horas)
+        self.assertNotIn('05:45 PM', horas)
+        self.assertNotIn('07:00 PM', horas)
+        self.assertNotIn('08:15 PM', horas)
+        self.assertIn('08:30 PM', horas)
+        self.assertEqual(len(horas), 40 - 11)
+
+
+class CalendarioHorariosTests(ReservasTestCase):
+
+    def listar_rango(self, end_date=None, people_amount=2):
+        datos = {'campus_id': self.campus.campus_id, 'start_date': self.fecha.isoformat(), 'people_amount': people_amount}
+        if end_date:
+            datos['end_date'] = end_date.isoformat()
+        return self.client.get('/api/bookings/list-hours-range/', datos)
+
+    def test_una_consulta_de_ocupacion_para_todo_el_rango(self):
+        for dia in range(0, 30, 3):
+            self.reservar(time(19, 0), 30, fecha=self.fecha + timedelta(days=dia))
+
+        # Sin cache: catálogo, horarios, cierres y la ocupación de todo el rango
+        for end_date in (self.fecha, self.fecha + timedelta(days=29)):
+            limpiar_caches()
+            with self.assertNumQueries(4):
+                response = self.listar_rango(end_date)
+            self.assertEqual(response.status_code, 200)
+
+        dias = {dia['booking_date']: dia['hours'] for dia in response.data['data']}
+        self.assertEqual(len(dias), 30)
+        self.assertNotIn('07:00 PM', dias[self.fecha.isoformat()])
+        self.assertIn('07:00 PM', dias[(self.fecha + timedelta(days=1)).isoformat()])
+
+        # Con cache no se consulta la base
+        with self.assertNumQueries(0):
+            self.assertEqual(self.listar_rango(self.fecha + timedelta(days=29)).data, response.data)
+
+    def test_cantidad_de_personas_invalida_responde_400(self):
+        for people_amount in ('abc', '0', '-2'):
+            response = self.listar_rango(people_amount=people_amount)
+            self.assertEqual(response.status_code, 400, people_amount)
+            self.assertEqual(response.data, ['Invalid people amount'])
+
+    def test_rango_invalido_responde_400(self):
+        self.assertEqual(self.listar_rango(self.fecha - timedelta(days=1)).status_code, 400)
+        self.assertEqual(self.listar_rango(self.fecha + timedelta(days=62)).status_code, 400)
+        self.assertEqual(self.listar_rango(self.fecha + timedelta(days=61)).status_code, 200)
+
+class CacheOcupacionTests(ReservasTestCase):
+
+    def horas(self):
+        return self.client.get('/api/bookings/list-hours/', {
+            'campus_id': self.campus.campus_id, 'booking_date': self.fecha.isoformat(), 'people_amount': 1,
+        }).data['data']
+
+    def escribir(self, metodo, ruta, datos):
+        # Las invalidaciones corren al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, metodo)(f'/api/bookings/{ruta}', datos, format='json')
+        self.assertIn(response.status_code, (200, 201))
+        return response
+
+    def crear(self):
+        response = self.escribir('post', 'create-booking/', {
+            'email': 'ana@example.com', 'campus_id': self.campus.campus_id, 'people_amount': 30,
+            'booking_date': self.fecha.isoformat(), 'booking_hour': '07:00 PM', 'observations': '',
+        })
+        return response.data['data']['booking_id']
+
+    def assertRecarga(self, disponible):
+        # Solo se vuelve a leer la ocupación del día
+        with self.assertNumQueries(1):
+            horas = self.horas()
+        self.assertEqual('07:00 PM' in horas, disponible)
+
+    def test_aciertos_sin_consultas(self):
+        self.reservar(time(19, 0), 30)
+        horas = self.horas()
+        aciertos = availability.cache_ocupacion.estadisticas()['hits']
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.horas(), horas)
+            perfil = availability.obtener_perfil_ocupacion(self.campus.campus_id, self.fecha.isoformat())
+        self.assertEqual(perfil.ocupacion('19:00'), 30)
+        self.assertEqual(availability.cache_ocupacion.estadisticas()['hits'], aciertos + 2)
+
+    def test_invalidada_al_crear_cancelar_y_actualizar_en_lote(self):
+        self.assertIn('07:00 PM', self.horas())
+
+        booking_id = self.crear()
+        self.assertRecarga(disponible=False)
+        self.escribir('put', 'update-booking/', {'booking_id': booking_id, 'status': 'cancelled'})
+        self.assertRecarga(disponible=True)
+
+        booking_id = self.crear()
+        self.assertRecarga(disponible=False)
+        self.escribir('post', 'update-bookings-bulk/', {'booking_ids': [booking_id], 'status': 'approved'})
+        self.assertRecarga(disponible=True)
+
+
+class DetalleReservaTests(ReservasTestCase):
+
+    def actualizar(self, booking, booking_status):
+        # Las invalidaciones corren al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/bookings/update-booking/', {'booking_id': booking.booking_id, 'status': booking_status}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_detalle_con_una_consulta_e_invalidado_al_actualizar(self):
+        booking = self.reservar(time(19, 0), 2)
+        url = f'/api/bookings/booking-id/{booking.booking_id}/'
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['data']['state'], 'PENDIENTE')
+        self.assertEqual(response.data['data']['email_person'], 'ANA@EXAMPLE.COM')
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.actualizar(booking, 'approved')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.data['data']['state'], 'GESTIONADA')
+
+    def test_detalle_de_reserva_inexistente(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/bookings/booking-id/999/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_reservas_de_persona_con_una_consulta(self):
+        bookings = [self.reservar(hora, 2) for hora in (time(13, 0), time(19, 0), time(21, 0))]
+        url = f'/api/bookings/booking-by-person/{self.person.person_id}/'
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual([booking['booking_id'] for booking in response.data['data']], [booking.booking_id for booking in bookings])
+
+        self.actualizar(bookings[0], 'cancelled')
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual([booking['booking_id'] for booking in response.data['data']], [booking.booking_id for booking in bookings[1:]])
+
+
+
+class ListadoCondicionalTests(ReservasTestCase):
+
+    def listar(self, **headers):
+        return self.client.get(f'/api/bookings/list-bookings/{self.campus.campus_id}/', headers=headers)
+
+    def actualizar(self, booking, booking_status):
+        response = self.client.put('/api/bookings/update-booking/', {'booking_id': booking.booking_id, 'status': booking_status}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def crear(self):
+        response = self.client.post('/api/bookings/create-booking/', {
+            'email': 'ana@example.com', 'campus_id': self.campus.campus_id, 'people_amount': 2,
+            'booking_date': self.fecha.isoformat(), 'booking_hour': '07:00 PM', 'observations': '',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return Booking.objects.get(booking_id=response.data['data']['booking_id'])
+
+    def assertCambia(self, etag):
+        response = self.listar(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_304_con_if_none_match_sin_consultar_reservas(self):
+        self.reservar(time(19, 0), 2)
+        etag = self.listar()['ETag']
+
+        # Solo la versión de la sede
+        with self.assertNumQueries(1):
+            response = self.listar(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_304_con_if_modified_since(self):
+        self.crear()
+        ultimo_cambio = self.listar()['Last-Modified']
+
+        self.assertEqual(self.listar(if_modified_since=ultimo_cambio).status_code, 304)
+        self.assertEqual(self.listar(if_modified_since='Mon, 01 Jan 2001 00:00:00 GMT').status_code, 200)
+
+    def test_etag_cambia_al_crear_cancelar_y_aprobar(self):
+        etag = self.listar()['ETag']
+
+        booking = self.crear()
+        etag = self.assertCambia(etag)
+        self.actualizar(booking, 'cancelled')
+        etag = self.assertCambia(etag)
+
+        booking = self.crear()
+        etag = self.assertCambia(etag)
+        self.actualizar(booking, 'approved')
+        self.assertCambia(etag)
+
+    def test_etag_cambia_al_editar_la_persona(self):
+        self.crear()
+        etag = self.listar()['ETag']
+
+        self.person.phone_number = '3109999999'
+        self.person.save()
+
+        self.assertCambia(etag)
+        self.assertEqual(self.listar().data['data'][0]['phone_person'], '3109999999')
+
+class PaginacionListadoTests(ReservasTestCase):
+
+    def test_recorre_las_paginas_sin_duplicados_ni_huecos(self):
+        horas = [time(19, 0)] * 7 + [time(19, 5), time(18, 0), time(19, 10)]
+        creadas = [self.reservar(hora, 1) for hora in horas]
+        creadas += [self.reservar(time(13, 0), 1, fecha=self.fecha + timedelta(days=1)) for _ in range(3)]
+        # La sede sale del catálogo del proceso; cargarlo no cuenta por página
+        catalog.obtener_catalogo()
+
+        vistas = []
+        cursor = None
+        paginas = 0
+        while True:
+            datos = {'page_size': 3} | ({'cursor': cursor} if cursor else {})
+            # Versión de la sede y página con su persona, sin importar el número de página
+            with self.assertNumQueries(2):
+                response = self.client.get(f'/api/bookings/list-bookings/{self.campus.campus_id}/', datos)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['data']), 3)
+            vistas += [reserva['booking_id'] for reserva in response.data['data']]
+            paginas += 1
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(paginas, 5)
+        self.assertEqual(len(vistas), len(set(vistas)))
+        esperadas = sorted(creadas, key=lambda booking: (booking.booking_date, booking.booking_slot, booking.booking_hour, booking.booking_id))
+        self.assertEqual(vistas, [booking.booking_id for booking in esperadas])
+
+    def test_cursor_invalido_responde_400(self):
+        response = self.client.get(f'/api/bookings/list-bookings/{self.campus.campus_id}/', {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+class CrearReservaTests(ReservasTestCase):
+
+    def crear(self, email, hora='07:00 PM'):
+        return self.client.post('/api/bookings/create-booking/', {
+            'email': email, 'name': 'Luis Carlos', 'last_name': 'Gomez Ruiz', 'date_of_birth': '1990-01-01',
+            'phone_number': '3001234567', 'send_email': False, 'campus_id': self.campus.campus_id,
+            'people_amount': 2, 'booking_date': self.fecha.isoformat(), 'booking_hour': hora, 'observations': '',
+        }, format='json')
+
+    def setUp(self):
+        super().setUp()
+        # La sede sale del catálogo del proceso; cargarlo no cuenta para el presupuesto
+        catalog.obtener_catalogo()
+        # Savepoint y su liberación, persona, duplicado, cupo, reserva, ocupación,
+        # correos y versión de la sede; en PostgreSQL además el bloqueo de capacidad
+        self.presupuesto = 9 + (1 if connection.vendor == 'postgresql' else 0)
+
+    def test_sentencias_con_persona_nueva(self):
+        # La persona nueva suma su inserción
+        with self.assertNumQueries(self.presupuesto + 1):
+            response = self.crear('luis@example.com')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(People.objects.filter(email='LUIS@EXAMPLE.COM', first_name='LUIS', second_last_name='RUIZ').exists())
+
+    def test_sentencias_con_persona_existente(self):
+        # El correo se busca sin distinguir mayúsculas
+        with self.assertNumQueries(self.presupuesto):
+            response = self.crear('ana@example.com')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['person_id'], self.person.person_id)
+        self.assertEqual(People.objects.count(), 1)
+
+    def test_persona_creada_al_mismo_tiempo_no_falla(self):
+        crear = People.objects.bulk_create
+
+        def crear_tras_otra_reserva(personas, **kwargs):
+            # Otra reserva inserta la persona entre la búsqueda y el upsert
+            self.otra = People.objects.create(
+                identification='2222222222', first_name='LUIS', first_last_name='GOMEZ',
+                date_of_birth=date(1990, 1, 1), email='LUIS@EXAMPLE.COM',
+            )
+            return crear(personas, **kwargs)
+
+        with mock.patch.object(People.objects, 'bulk_create', crear_tras_otra_reserva):
+            response = self.crear('luis@example.com')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['person_id'], self.otra.person_id)
+        self.assertEqual(People.objects.filter(email='LUIS@EXAMPLE.COM').count(), 1)
+
+    def test_datos_de_persona_demasiado_largos_responden_400(self):
+        response = self.client.post('/api/bookings/create-booking/', {
+            'email': 'luis@example.com', 'name': 'L' * 101, 'last_name': 'Gomez', 'date_of_birth': '1990-01-01',
+            'campus_id': self.campus.campus_id, 'people_amount': 2, 'booking_date': self.fecha.isoformat(), 'booking_hour': '07:00 PM',
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(People.objects.filter(email='LUIS@EXAMPLE.COM').exists())
+        self.assertFalse(Booking.objects.exists())
+
+    def test_reserva_duplicada_no_escribe(self):
+        self.reservar(time(13, 0), 2)
+        response = self.crear('ana@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_respuesta_sin_columnas_internas(self):
+        response = self.crear('ana@example.com')
+        self.assertEqual(response.status_code, 201)
+        listado = self.client.get('/api/bookings/create-booking/')
+        for reserva in (response.data['data'], listado.data[0]):
+            self.assertNotIn('booking_slot', reserva)
+            self.assertNotIn('reminder_sent_at', reserva)
+            self.assertIn('booking_hour', reserva)
+
+
+class IdempotenciaTests(ReservasTestCase):
+
+    def crear(self, clave, email='ana@example.com', people_amount=2):
+        return self.client.post('/api/bookings/create-booking/', {
+            'email': email, 'name': 'Luis', 'last_name': 'Gomez', 'date_of_birth': '1990-01-01',
+            'campus_id': self.campus.campus_id, 'people_amount': people_amount,
+            'booking_date': self.fecha.isoformat(), 'booking_hour': '07:00 PM', 'observations': '',
+        }, format='json', headers={'Idempotency-Key': clave})
+
+    def test_repeticion_devuelve_la_respuesta_guardada_con_una_consulta(self):
+        original = self.crear('clave-1')
+        self.assertEqual(original.status_code, 201)
+        correos = EmailOutbox.objects.count()
+
+        # Solo la búsqueda de la clave: ni persona, ni cupo, ni bloqueo
+        with self.assertNumQueries(1):
+            repetida = self.crear('clave-1')
+
+        self.assertEqual(repetida.status_code, 201)
+        self.assertEqual(repetida['Idempotent-Replayed'], 'true')
+        self.assertEqual(repetida.json(), original.json())
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(EmailOutbox.objects.count(), correos)
+
+    def test_misma_clave_con_otros_datos_responde_400(self):
+        self.assertEqual(self.crear('clave-1').status_code, 201)
+
+        response = self.crear('clave-1', people_amount=3)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_clave_vencida_se_reclama_de_nuevo(self):
+        self.assertEqual(self.crear('clave-1').status_code, 201)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = self.crear('clave-1', email='luis@example.com')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Booking.objects.count(), 2)
+        clave = IdempotencyKey.objects.get(key='clave-1')
+        self.assertGreater(clave.expires_at, timezone.now())
+        self.assertEqual(clave.response_body['data']['booking_id'], response.data['data']['booking_id'])
+
+class StreamDisponibilidadTests(ReservasTestCase):
+
+    def url(self):
+        return f'/api/bookings/stream-availability/?campus_id={self.campus.campus_id}&booking_date={self.fecha.isoformat()}'
+
+    def crear_reserva(self):
+        # Los eventos se publican al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/bookings/create-booking/', {
+                'email': 'ana@example.com', 'campus_id': self.campus.campus_id, 'people_amount': 2,
+                'booking_date': self.fecha.isoformat(), 'booking_hour': '07:00 PM', 'observations': '',
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['data']['booking_id']
+
+    async def test_recibe_los_eventos_de_una_reserva(self):
+        response = await self.async_client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+
+        async def siguiente():
+            mensaje = await asyncio.wait_for(anext(stream), 5)
+            return mensaje.decode() if isinstance(mensaje, bytes) else mensaje
+
+        try:
+            self.assertTrue((await siguiente()).startswith('event: ready\n'))
+            booking_id = await sync_to_async(self.crear_reserva)()
+
+            recibidos = [await siguiente(), await siguiente()]
+            self.assertEqual(recibidos[0], events.formatear({'event': 'availability', 'data': {
+                'campus_id': self.campus.campus_id, 'booking_date': self.fecha.isoformat(), 'slot': 76, 'people_delta': 2,
+            }}))
+            self.assertEqual(recibidos[1], events.formatear({'event': 'booking', 'data': {
+                'campus_id': self.campus.campus_id, 'booking_date': self.fecha.isoformat(), 'booking_id': booking_id, 'change': 'created',
+            }}))
+            # Al desconectarse el cliente, el servidor cancela la lectura en curso
+            lectura = asyncio.ensure_future(siguiente())
+            await asyncio.sleep(0)
+            lectura.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await lectura
+        finally:
+            await stream.aclose()
+        self.assertEqual(events.central.estadisticas()['subscribers'], 0)
+
+    def test_bajo_wsgi_responde_501(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(events.central.estadisticas()['subscribers'], 0)
+
+
+
+
+class ActualizacionMasivaTests(ReservasTestCase):
+
+    def test_libera_el_cupo_de_las_reservas_activas(self):
+        otra_fecha = date(2099, 3, 4)
+        bookings = [self.reservar(time(19, 0), 10), self.reservar(time(19, 0), 5, fecha=otra_fecha), self.reservar(time(13, 0), 2)]
+        Booking.objects.filter(booking_id=bookings[2].booking_id).update(active=False)
+
+        response = self.client.post('/api/bookings/update-bookings-bulk/', {
+            'booking_ids': [booking.booking_id for booking in bookings] + [999], 'status': 'cancelled',
+        }, format='json')
+
+        self.assertEqual([result['result'] for result in response.data['data']], ['cancelled', 'cancelled', 'not_active', 'not_found'])
+        self.assertEqual(set(SlotOccupancy.objects.values_list('occupancy_date', 'slot', 'people_total')), {
+            (self.fecha, 76, 0), (otra_fecha, 76, 0), (self.fecha, 52, 2),
+        })
+
+
+class ImportarReservasTests(ReservasTestCase):
+
+    def test_filas_rechazadas_no_crean_personas(self):
+        fila = {
+            'name': 'Luis', 'last_name': 'Gomez', 'date_of_birth': '1990-01-01', 'phone_number': '3001234567',
+            'campus_id': self.campus.campus_id, 'people_amount': 20, 'booking_date': self.fecha.isoformat(),
+            'booking_hour': '19:00', 'observations': '',
+        }
+        reporte = imports.importar_reservas([
+            dict(fila, email='nuevo1@example.com'),
+            dict(fila, email='nuevo2@example.com'),  # Sin cupo: 20 + 20 > 30
+            dict(fila, email='nuevo1@example.com', booking_hour='13:00', people_amount=2),  # Duplicada en el lote
+            dict(fila, email='ana@example.com', booking_hour='13:00', people_amount=2),
+        ])
+
+        self.assertEqual([fila['result'] for fila in reporte], ['accepted', 'rejected', 'rejected', 'accepted'])
+        self.assertEqual(set(People.objects.values_list('email', flat=True)), {'ANA@EXAMPLE.COM', 'NUEVO1@EXAMPLE.COM'})
+        self.assertEqual(Booking.objects.get(booking_id=reporte[3]['booking_id']).person_id, self.person)
+
+
+
+class ResumenSedeTests(ReservasTestCase):
+
+    def test_resumen_no_recarga_el_catalogo(self):
+        booking = self.reservar(time(19, 0), 2)
+        CampusDigestEvent.objects.create(campus_id=self.campus, booking_id=booking, booking_status='confirmada', payload={
+            'nombre_cliente': 'ANA PEREZ', 'fecha_reserva': '2099-03-03', 'hora_reserva': '19:00',
+            'cantidad_personas': 2, 'celular': '3001234567', 'observaciones': '',
+        })
+        catalog.obtener_catalogo()
+        ahora = timezone.now()
+
+        self.assertEqual(digests.enviar_resumen(self.campus.campus_id, ahora), 1)
+
+        self.assertEqual(Campus.objects.get(campus_id=self.campus.campus_id).last_digest_at, ahora)
+        self.assertEqual(EmailOutbox.objects.get().kind, EmailOutbox.CAMPUS_DIGEST)
+        with self.assertNumQueries(0):
+            catalog.obtener_sede(self.campus.campus_id)
+
+
+
+class VistasAsyncTests(ReservasTestCase):
+
+    async def comparar(self, ruta, **headers):
+        """
+        Pide la ruta a la vista síncrona y a la async y compara las respuestas.
+        """
+        sincrona = await sync_to_async(self.client.get)(f'/api/bookings/{ruta}', headers=headers)
+        asincrona = await self.async_client.get(f'/api/bookings/async/{ruta}', headers=headers)
+        self.assertEqual(asincrona.status_code, sincrona.status_code)
+        self.assertEqual(asincrona.json(), sincrona.json())
+        self.assertEqual(asincrona.get('WWW-Authenticate'), sincrona.get('WWW-Authenticate'))
+        return asincrona
+
+    async def test_mismas_respuestas_que_las_vistas_sincronas(self):
+        booking = await sync_to_async(self.reservar)(time(19, 0), 2)
+        self.assertEqual((await self.comparar(f'booking-id/{booking.booking_id}/')).status_code, 200)
+        self.assertEqual((await self.comparar('booking-id/999/')).status_code, 404)
+        self.assertEqual((await self.comparar(f'booking-by-person/{self.person.person_id}/')).status_code, 200)
+
+    async def test_token_invalido_responde_401_como_la_vista_sincrona(self):
+        response = await self.comparar('list-campuses/', Authorization='Bearer token-invalido')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+
+class CacheLRUTests(SimpleTestCase):
+
+    def test_descarta_lecturas_anteriores_a_una_invalidacion(self):
+        cache = CacheLRU(max_entradas=2, ttl_segundos=60)
+        generacion = cache.generacion('a')
+        cache.invalidar('a')
+        cache.guardar('a', 'viejo', generacion)
+        self.assertIsNone(cache.obtener('a'))
+
+        cache.guardar('a', 'nuevo', cache.generacion('a'))
+        self.assertEqual(cache.obtener('a'), 'nuevo')
+
+    def test_invalidaciones_acotadas(self):
+        cache = CacheLRU(max_entradas=2, ttl_segundos=60)
+        generacion = cache.generacion('a')
+        for clave in range(100):
+            cache.invalidar(clave)
+        self.assertEqual(len(cache._invalidadas), 2)
+
+        # La invalidación de 'a' pudo olvidarse: una lectura anterior no se guarda
+        cache.guardar('a', 'viejo', generacion)
+        self.assertIsNone(cache.obtener('a'))
+
+
+
+def iniciar_servidor_smtp(prueba):
+    """
+    Arranca un servidor SMTP local en un hilo y dirige a él los correos de la
+    conexión compartida mientras dure la prueba.
+
+    :param prueba: Prueba en curso (TestCase).
+    :return: Servidor (ServidorSMTPLocal).
+    """
+    servidor = ServidorSMTPLocal(espera_saludo=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    host, port = servidor.server_address
+    configuracion = override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', EMAIL_HOST=host, EMAIL_PORT=port,
+        EMAIL_USE_SSL=False, EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+    )
+    configuracion.enable()
+    prueba.addCleanup(configuracion.disable)
+    prueba.addCleanup(servidor.server_close)
+    prueba.addCleanup(servidor.shutdown)
+    prueba.addCleanup(mailing.cerrar_conexion)
+    mailing.cerrar_conexion()
+    mailing.reiniciar_estadisticas()
+    return servidor
+
+
+class ConexionSMTPTests(TestCase):
+    """
+    Envíos por la conexión compartida contra un servidor SMTP en un hilo.
+    """
+
+    def setUp(self):
+        self.servidor = iniciar_servidor_smtp(self)
+
+    def mensaje(self, numero):
+        return EmailMessage(f'Prueba {numero}', '<p>Prueba</p>', 'reservas@example.com', ['cliente@example.com'])
+
+    def test_reutiliza_una_conexion_para_varios_mensajes(self):
+        for numero in range(5):
+            self.assertTrue(mailing.enviar_correo(self.mensaje(numero)))
+
+        self.assertEqual(len(self.servidor.mensajes), 5)
+        self.assertEqual(self.servidor.conexiones, 1)
+        self.assertEqual(mailing.estadisticas()['connections'], 1)
+
+    def test_reconecta_si_el_servidor_corta_la_conexion(self):
+        self.assertTrue(mailing.enviar_correo(self.mensaje(1)))
+        self.servidor.cortar_conexiones()
+        self.assertTrue(mailing.enviar_correo(self.mensaje(2)))
+
+        self.assertEqual(len(self.servidor.mensajes), 2)
+        self.assertEqual(self.servidor.conexiones, 2)
+        self.assertEqual(mailing.estadisticas()['reconnections'], 1)
+
+    def test_corte_a_mitad_del_lote_no_repite_mensajes(self):
+        self.servidor.cortar_despues_de = 3
+        self.assertEqual(mailing.enviar_mensajes([self.mensaje(numero) for numero in range(6)]), 6)
+
+        asuntos = Counter(mensaje.split(b'Subject: ')[1].split(b'\r\n')[0] for mensaje in self.servidor.mensajes)
+        self.assertEqual(asuntos, Counter({f'Prueba {numero}'.encode(): 1 for numero in range(6)}))
+        self.assertEqual(self.servidor.conexiones, 2)
+        self.assertEqual(mailing.estadisticas()['reconnections'], 1)
+
+    def test_bandeja_guarda_el_error_del_servidor(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        correo = outbox.encolar_correo(EmailOutbox.CAMPUS_DIGEST, correo_destinatario='sede1@example.com', sede_reserva='Sede 1', reservas=[])
+
+        self.assertEqual(outbox.procesar_lote(), (0, 1))
+        correo.refresh_from_db()
+        self.assertEqual(correo.status, EmailOutbox.PENDING)
+        self.assertIn('refused', correo.last_error)
+        self.assertGreater(correo.next_attempt_at, timezone.now())
+
+
+
+class RecordatoriosTests(ReservasTestCase):
+    ahora = timezone.make_aware(datetime(2099, 3, 3, 10, 0))
+
+    def setUp(self):
+        super().setUp()
+        self.servidor = iniciar_servidor_smtp(self)
+        People.objects.filter(pk=self.person.pk).update(send_email=True)
+        self.reservas = {}
+        for hora, correo in ((13, 'malo@example.com'), (14, 'ana@example.com'), (15, 'luis@example.com')):
+            persona = People.objects.filter(email=correo.upper()).first() or People.objects.create(
+                identification='1000000001', first_name='LUIS', first_last_name='GOMEZ',
+                date_of_birth=date(1990, 1, 1), email=correo.upper(), send_email=True,
+            )
+            self.reservas[correo] = self.reservar(time(hora, 0), 2, person=persona)
+
+    def recibidos(self, correo):
+        return sum(f'To: {correo.upper()}'.encode() in mensaje for mensaje in self.servidor.mensajes)
+
+    def test_rechazo_definitivo_no_repite_ni_bloquea_los_lotes(self):
+        self.servidor.rechazar = {'malo@example.com': 550}
+
+        recordadas, enviados, liberadas, errores = reminders.enviar_recordatorios(ahora=self.ahora, tamano=1)
+        self.assertEqual((recordadas, enviados, liberadas), (2, 2, 0))
+        self.assertEqual([ids for ids, _ in errores], [[self.reservas['malo@example.com'].booking_id]])
+        for _ in range(2):
+            self.assertEqual(reminders.enviar_recordatorios(ahora=self.ahora, tamano=1), (0, 0, 0, []))
+
+        self.assertEqual(self.recibidos('ana@example.com'), 1)
+        self.assertEqual(self.recibidos('luis@example.com'), 1)
+        self.assertFalse(Booking.objects.filter(reminder_sent_at__isnull=True).exists())
+
+    def test_error_temporal_libera_solo_lo_no_enviado(self):
+        self.servidor.rechazar = {'ana@example.com': 450}
+
+        self.assertEqual(reminders.enviar_recordatorios(ahora=self.ahora)[:3], (1, 1, 2))
+        self.assertEqual(set(Booking.objects.filter(reminder_sent_at__isnull=True).values_list('person_id__email', flat=True)), {'ANA@EXAMPLE.COM', 'LUIS@EXAMPLE.COM'})
+
+        self.servidor.rechazar = {}
+        self.assertEqual(reminders.enviar_recordatorios(ahora=self.ahora), (2, 2, 0, []))
+        for correo in self.reservas:
+            self.assertEqual(self.recibidos(correo), 1)
+
+    def test_ejecuciones_superpuestas_no_repiten(self):
+        # Otra ejecución reclamó el primer lote y aún lo está enviando
+        reclamadas, _ = reminders.reclamar_lote(self.ahora, self.ahora + timedelta(hours=24), 1)
+
+        self.assertEqual(reminders.enviar_recordatorios(ahora=self.ahora)[:3], (2, 2, 0))
+        self.assertEqual(reclamadas, [self.reservas['malo@example.com']])
+        self.assertEqual(self.recibidos('malo@example.com'), 0)
+
+@skipUnless(connection.vendor == 'postgresql', 'El bloqueo de capacidad usa advisory locks de PostgreSQL')
+class CapacidadConcurrenteTests(TransactionTestCase):
+    hilos = 8
+    peticiones = 40
+
+    def setUp(self):
+        limpiar_caches()
+        self.sedes = [
+            Campus.objects.create(name=f'Sede {numero}', address='Calle 1', phone='3000000000', email=f'sede{numero}@example.com')
+            for numero in range(1, 5)
+        ]
+        self.campus = self.sedes[0]
+        for sede in self.sedes:
+            CampusSchedule.objects.create(campus_id=sede, start_time=time(12, 0), end_time=time(22, 0))
+
+    def cuerpo(self, numero, sede, fecha='2099-03-03'):
+        return {
+            'email': f'persona{numero}@example.com', 'name': 'Ana', 'last_name': 'Perez',
+            'date_of_birth': '1990-01-01', 'phone_number': '3001234567', 'send_email': False,
+            'campus_id': sede.campus_id, 'people_amount': 2,
+            'booking_date': fecha, 'booking_hour': '07:00 PM', 'observations': '',
+        }
+
+    def enviar_concurrentes(self, nombre, cuerpos):
+        """
+        Envía los cuerpos a create-booking/ desde varios hilos y reporta el
+        rendimiento en la salida de la prueba.
+
+        :return: Códigos de respuesta (Counter).
+        """
+        pendientes = iter(cuerpos)
+        lock = threading.Lock()
+        resultados = Counter()
+
+        def trabajador():
+            client = APIClient()
+            try:
+                while True:
+                    with lock:
+                        cuerpo = next(pendientes, None)
+                    if cuerpo is None:
+                        return
+                    response = client.post('/api/bookings/create-booking/', cuerpo, format='json')
+                    with lock:
+                        resultados[response.status_code] += 1
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=trabajador) for _ in range(self.hilos)]
+        inicio = perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        duracion = perf_counter() - inicio
+
+        sys.stderr.write(f'\n{nombre}: {len(cuerpos)} create-booking/ from {self.hilos} threads in {duracion * 1000:.0f} ms, {len(cuerpos) / duracion:.1f} req/s\n')
+        self.assertEqual(sum(resultados.values()), len(cuerpos))
+        return resultados
+
+    def test_reservas_concurrentes_no_superan_la_capacidad(self):
+        resultados = self.enviar_concurrentes('same slot', [self.cuerpo(numero, self.campus) for numero in range(self.peticiones)])
+
+        self.assertEqual(set(resultados) - {201, 400}, set(), resultados)
+        self.assertGreater(resultados[201], 0)
+
+        reservadas = Booking.objects.filter(campus_id=self.campus, active=True).aggregate(total=Sum('people_amount'))['total']
+        ocupacion = SlotOccupancy.objects.filter(campus_id=self.campus).aggregate(total=Sum('people_total'))['total']
+        self.assertLessEqual(reservadas, CAPACIDAD_MAXIMA)
+        self.assertEqual(reservadas, ocupacion)
+        self.assertEqual(reservadas, resultados[201] * 2)
+
+    def test_rendimiento_con_sedes_y_fechas_distintas(self):
+        cuerpos = [
+            self.cuerpo(numero, self.sedes[numero % len(self.sedes)], f'2099-03-{numero // len(self.sedes) + 1:02d}')
+            for numero in range(self.peticiones)
+        ]
+        resultados = self.enviar_concurrentes('distinct campus/date', cuerpos)
+
+        self.assertEqual(resultados, Counter({201: self.peticiones}))
+
+    def test_otra_sede_o_fecha_no_espera_el_bloqueo(self):
+        tomado, liberar = threading.Event(), threading.Event()
+
+        def reserva_en_curso():
+            try:
+                with transaction.atomic():
+                    occupancy.bloquear_capacidad(self.campus.campus_id, date(2099, 3, 3))
+                    tomado.set()
+                    liberar.wait(10)
+            finally:
+                connection.close()
+
+        hilo = threading.Thread(target=reserva_en_curso)
+        hilo.start()
+        self.addCleanup(hilo.join)
+        self.addCleanup(liberar.set)
+        self.assertTrue(tomado.wait(10))
+
+        with transaction.atomic():
+            # Un bloqueo que tuviera que esperar falla con lock_timeout en lugar de colgarse
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL lock_timeout = '1s'")
+            occupancy.bloquear_capacidad(self.sedes[1].campus_id, date(2099, 3, 3))
+            occupancy.bloquear_capacidad(self.campus.campus_id, date(2099, 3, 4))
+
+            # La misma sede y fecha sí espera
+            with self.assertRaises(OperationalError):
+                with transaction.atomic():
+                    occupancy.bloquear_capacidad(self.campus.campus_id, date(2099, 3, 3))
@@ -1,14 +1,27 @@
 from django.urls import path
 import bookings.views as views
+import bookings.async_views as async_views
 
 urlpatterns = [
     path('list-campuses/', views.CampusList.as_view(), name='list_campuses'),
     path('campus-details/<int:campus_id>/', views.CampusDetail.as_view(), name='campus_by_id'),
     path('list-hours/', views.BookingHourList.as_view(), name='list_hours'),
+    path('list-hours-range/', views.BookingCalendarList.as_view(), name='list_hours_range'),
+    path('stream-availability/', async_views.AvailabilityStream.as_view(), name='stream_availability'),
+    path('availability-cache-stats/', views.AvailabilityCacheStats.as_view(), name='availability_cache_stats'),
     path('create-booking/', views.BookingCreate.as_view(), name='create_booking'),
     path('list-bookings/<int:campus_id>/', views.BookingList.as_view(), name='list_bookings'),
+    path('export-bookings/<int:campus_id>/', views.BookingExport.as_view(), name='export_bookings'),
     path('booking-id/<int:booking_id>/', views.BookingByIdView.as_view(), name='booking_by_id'),
     path('booking-by-person/<int:person_id>/', views.BookingActivasByPersonView.as_view(), name='booking_by_person'),
     path('update-booking/', views.BookingUpdate.as_view(), name='update_booking'),
+    path('update-bookings-bulk/', views.BookingBulkUpdate.as_view(), name='update_bookings_bulk'),
+    path('import-bookings/', views.BookingImport.as_view(), name='import_bookings'),
+    # Versiones async de las lecturas más consultadas, con las mismas respuestas (requieren ASGI)
+    path('async/list-campuses/', async_views.AsyncCampusList.as_view(), name='async_list_campuses'),
+    path('async/list-hours/', async_views.AsyncBookingHourList.as_view(), name='async_list_hours'),
+    path('async/list-bookings/<int:campus_id>/', async_views.AsyncBookingList.as_view(), name='async_list_bookings'),
+    path('async/booking-id/<int:booking_id>/', async_views.AsyncBookingById.as_view(), name='async_booking_by_id'),
+    path('async/booking-by-person/<int:person_id>/', async_views.AsyncBookingActivasByPerson.as_view(), name='async_booking_by_person'),
 
 ]
\ No newline at end of file
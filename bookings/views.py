@@ -4,19 +4,44 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, NotFound, PermissionDenied
 from bookings.models import Campus, Booking
 from users.models import People
-from users.views import PeopleCreate
 from bookings.serializers import CampusSerializerList, CampusSerializerDetail, BookingSerializer, BookingListSerializer, BookingByIdSerializer
 import bookings.utils as utils
-from datetime import datetime
+import bookings.availability as availability
+import bookings.occupancy as occupancy
+import bookings.outbox as outbox
+import bookings.pagination as pagination
+import bookings.exports as exports
+import bookings.conditional as conditional
+import bookings.catalog as catalog
+import bookings.details as details
+import bookings.imports as imports
+import bookings.idempotency as idempotency
+import bookings.events as events
+from bookings.slots import slot_de_hora
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models.functions import Upper
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from datetime import datetime, timedelta
 
 
 class CampusList(generics.ListAPIView):
     serializer_class = CampusSerializerList
 
     def get(self, request, *args, **kwargs):
-        campus = Campus.objects.all()
+        campus = catalog.listar_sedes()
+        etag = catalog.etag_catalogo()
+        modified = max((sede.modification_date for sede in campus), default=None)
+        not_modified = conditional.respuesta_no_modificada(request, etag, modified)
+        if not_modified:
+            return not_modified
+
         serializer = self.serializer_class(campus, many=True)
-        return Response({'success': True, 'message': 'Campus List', 'data': serializer.data}, status=status.HTTP_200_OK)
+        response = Response({'success': True, 'message': 'Campus List', 'data': serializer.data}, status=status.HTTP_200_OK)
+        return conditional.agregar_validadores(response, etag, modified)
     
 
 class CampusDetail(generics.RetrieveAPIView):
@@ -27,14 +52,18 @@ class CampusDetail(generics.RetrieveAPIView):
         if not campus_id:
             raise ValidationError('Missing required fields')
         
-        try:
-            campus = Campus.objects.get(campus_id=campus_id)
-        except Campus.DoesNotExist:
+        campus = catalog.obtener_sede(campus_id)
+        if campus is None:
             raise NotFound('Campus not found')
-        
-        campus = Campus.objects.get(campus_id=campus_id)
+
+        etag = catalog.etag_sede(campus.campus_id)
+        not_modified = conditional.respuesta_no_modificada(request, etag, campus.modification_date)
+        if not_modified:
+            return not_modified
+
         serializer = self.serializer_class(campus)
-        return Response({'success': True, 'message': 'Campus Detail', 'data': serializer.data}, status=status.HTTP_200_OK)
+        response = Response({'success': True, 'message': 'Campus Detail', 'data': serializer.data}, status=status.HTTP_200_OK)
+        return conditional.agregar_validadores(response, etag, campus.modification_date)
 
 
 class BookingHourList(generics.ListAPIView):
@@ -48,10 +77,10 @@ class BookingHourList(generics.ListAPIView):
         if not campus_id or not booking_date: 
             raise ValidationError('Missing required fields')
         
-        if not Campus.objects.filter(campus_id=campus_id).exists():
+        campus = catalog.obtener_sede(campus_id)
+        if campus is None:
             raise NotFound('Campus not found')
-        
-        campus = Campus.objects.get(campus_id=campus_id)
+
         hours_list = utils.obtener_horarios_permitidos(campus.campus_id, booking_date, people_amount)
         hours_list = [utils.convert_to_am_pm(hour) for hour in hours_list]
 
@@ -59,66 +88,128 @@ class BookingHourList(generics.ListAPIView):
         return Response({'success': True, 'message': 'Hours List', 'data': hours_list}, status=status.HTTP_200_OK)
 
 
+class BookingCalendarList(generics.ListAPIView):
+    default_days = 30
+    max_days = 62
+
+    def get(self, request):
+        data = request.query_params
+        campus_id = data.get('campus_id')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        people_amount = data.get('people_amount')
+
+        if not campus_id or not start_date or not people_amount:
+            raise ValidationError('Missing required fields')
+
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            if end_date:
+                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            else:
+                end_date = start_date + timedelta(days=self.default_days - 1)
+        except ValueError:
+            raise ValidationError('Invalid date format')
+
+        if end_date < start_date or (end_date - start_date).days >= self.max_days:
+            raise ValidationError('Invalid date range')
+
+        try:
+            people_amount = utils.validar_cantidad(people_amount)
+        except ValueError:
+            raise ValidationError('Invalid people amount')
+
+        if catalog.obtener_sede(campus_id) is None:
+            raise NotFound('Campus not found')
+
+        calendar = utils.obtener_horarios_rango(int(campus_id), start_date, end_date, people_amount)
+        days_list = [
+            {'booking_date': booking_date, 'hours': [utils.convert_to_am_pm(hour) for hour in hours]}
+            for booking_date, hours in calendar.items()
+        ]
+
+        return Response({'success': True, 'message': 'Calendar Hours List', 'data': days_list}, status=status.HTTP_200_OK)
+
+
+class AvailabilityCacheStats(generics.GenericAPIView):
+
+    def get(self, request):
+        stats = availability.cache_ocupacion.estadisticas()
+        return Response({'success': True, 'message': 'Availability Cache Stats', 'data': stats}, status=status.HTTP_200_OK)
+
+
 class BookingCreate(generics.ListCreateAPIView):
     queryset = Booking.objects.all()
     serializer_class = BookingSerializer
 
-    def create_person(self, person_data):
-        instance_people = PeopleCreate()
-        person = instance_people.create_person(person_data)
+    def get_or_create_person(self, data):
+        # Una consulta por el índice de UPPER(email) y, si no existe, un upsert
+        email = str(data['email']).upper()
+        person = People.objects.annotate(email_upper=Upper('email')).filter(email_upper=email).order_by('person_id').first()
+        if person is not None:
+            return person
+
+        if any(not data.get(field) for field in ('name', 'last_name', 'date_of_birth')):
+            raise ValidationError('Missing required fields')
+
         try:
-            person = People.objects.get(person_id=person['person_id'])
-        except People.DoesNotExist:
-            raise NotFound('Person not found')
-        
+            date_of_birth = datetime.strptime(str(data['date_of_birth']), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValidationError('Invalid person data')
+
+        names = str(data['name']).split(' ')
+        apellidos = str(data['last_name']).split(' ')
+        person = People(
+            identification="2222222222",
+            first_name=names[0].upper(),
+            second_name=names[1].upper() if len(names) > 1 else None,
+            first_last_name=apellidos[0].upper(),
+            second_last_name=apellidos[1].upper() if len(apellidos) > 1 else None,
+            date_of_birth=date_of_birth,
+            phone_number=data.get('phone_number'),
+            email=email,
+            send_email=bool(data.get('send_email')),
+        )
+
+        # Las mismas validaciones de campo que PeopleSerializer (longitudes y correo), sin consultas
+        try:
+            person.full_clean(validate_unique=False, validate_constraints=False)
+        except DjangoValidationError:
+            raise ValidationError('Invalid person data')
+
+        # ON CONFLICT: si otra reserva creó la persona al mismo tiempo, se toma su ID en lugar de fallar
+        People.objects.bulk_create(
+            [person], update_conflicts=True, unique_fields=['identification', 'email'], update_fields=['email'],
+        )
         return person
-    
-    def create_booking(self, booking_data):
 
-        serializer = self.serializer_class(data=booking_data)
-        if serializer.is_valid():
-            serializer.save()
-            return serializer.data
-        raise ValidationError('Invalid data', serializer.errors)
-    
-    def validate_booking(self, booking_data):
-        booking = Booking.objects.filter(campus_id=booking_data['campus_id'], person_id=booking_data['person_id'], active=True)
-        if booking.exists():
-            for book in booking:
-                date = datetime.strptime(booking_data['booking_date'], "%Y-%m-%d").date()
-                if book.booking_date == date:
-                    raise ValidationError('Booking already exists')
-        
+    def validate_booking(self, person, campus, booking_date):
+        # La base responde si la persona ya tiene una reserva activa ese día
+        if Booking.objects.filter(person_id=person, campus_id=campus, booking_date=booking_date, active=True).exists():
+            raise ValidationError('Booking already exists')
+
     def post(self, request, *args, **kwargs):
         data = request.data
 
         if not data:
             raise ValidationError('No data provided')
-        
-        person = People.objects.filter(email=str(data['email']).upper()).exists()
-        if not person:
-            names = str(data['name'])
-            apellidos = str(data['last_name'])
-            person_data = {
-                'identification': "2222222222",
-                'first_name': names.split(' ')[0].upper(),
-                'second_name': names.split(' ')[1].upper() if len(names.split(' ')) > 1 else None,
-                'first_last_name': apellidos.split(' ')[0].upper(),
-                'second_last_name': apellidos.split(' ')[1].upper() if len(apellidos.split(' ')) > 1 else None,
-                'date_of_birth': data['date_of_birth'],
-                'phone_number': data['phone_number'],
-                'email': str(data['email']).upper(),
-                'send_email': data['send_email']
-            }
-            person = self.create_person(person_data)
-        else:
-            person = People.objects.filter(email=str(data['email']).upper()).first()
-        
-        campus_id = data['campus_id']
-        people_amount = data['people_amount']
-        booking_date = data['booking_date']
-        booking_hour = data['booking_hour']
-        observations = data['observations']
+
+        # Un reintento con la misma Idempotency-Key recibe la respuesta guardada sin repetir el trabajo
+        idempotency_key = idempotency.clave_de_peticion(request)
+        if idempotency_key:
+            request_hash = idempotency.huella(data)
+            replay = idempotency.respuesta_guardada(idempotency_key, 'create-booking', request_hash)
+            if replay is not None:
+                return replay
+
+        if not data.get('email'):
+            raise ValidationError('Missing required fields')
+
+        campus_id = data.get('campus_id')
+        people_amount = data.get('people_amount')
+        booking_date = data.get('booking_date')
+        booking_hour = data.get('booking_hour')
+        observations = data.get('observations')
 
         if not campus_id or not people_amount or not booking_date or not booking_hour:
             raise ValidationError('Missing required fields')
@@ -128,58 +219,172 @@ class BookingCreate(generics.ListCreateAPIView):
         
         if not isinstance(booking_date, str) or not isinstance(booking_hour, str):
             raise ValidationError('Invalid date or hour')
-        
-        try:
-            campus = Campus.objects.get(campus_id=campus_id)
-        except Campus.DoesNotExist:
-            raise NotFound('Campus not found')
 
-        booking_data = {
-            'person_id': person.person_id,
-            'campus_id': campus.campus_id,
-            'people_amount': people_amount,
-            'booking_date': booking_date,
-            'booking_hour': utils.convert_to_24(booking_hour),
-            'observations': observations,
-            'active': True,
-            'approved': False
-        }
-
-        self.validate_booking(booking_data)
-
-        booking = self.create_booking(booking_data)
-        observaciones = booking_data['observations'] if booking_data['observations'] != "" else 'Sin observaciones'
         try:
-            utils.enviar_correo_confirmacion_reserva(person.email, f'{person.first_name} {person.first_last_name}', booking_data['booking_date'], booking_data['booking_hour'], campus.name, booking_data['people_amount'], observaciones, 'confirmada')
-            utils.enviar_correo_confirmacion_reserva_sede(campus.email, campus.name, f'{person.first_name} {person.first_last_name}', booking_data['booking_date'], booking_data['booking_hour'], booking_data['people_amount'], person.phone_number, observaciones, 'confirmada')
-        except Exception as e:
-            return Response({'success': False, 'message': f'Error sending email: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
+            booking_date = datetime.strptime(booking_date, '%Y-%m-%d').date()
+            booking_hour = datetime.strptime(utils.convert_to_24(booking_hour), '%H:%M').time()
+        except ValueError:
+            raise ValidationError('Invalid date or hour')
         
-        return Response({'success': True, 'message': 'Booking created successfully', 'data': booking}, status=status.HTTP_201_CREATED)
+        campus = catalog.obtener_sede(campus_id)
+        if campus is None:
+            raise NotFound('Campus not found')
+
+        booking_slot = slot_de_hora(booking_hour)
+
+        # El bloqueo por sede y fecha hace atómicas la verificación de cupo y la inserción
+        with transaction.atomic():
+            if idempotency_key:
+                replay = idempotency.reclamar(idempotency_key, 'create-booking', request_hash)
+                if replay is not None:
+                    return replay
+
+            person = self.get_or_create_person(data)
+            occupancy.bloquear_capacidad(campus.campus_id, booking_date)
+            self.validate_booking(person, campus, booking_date)
+
+            if not occupancy.hay_capacidad(campus.campus_id, booking_date, booking_slot, people_amount):
+                raise ValidationError('No availability for the selected hour')
+
+            # La sede viene del catálogo y la persona ya está cargada: se inserta sin validar las llaves de nuevo
+            booking = Booking(person_id=person, campus_id=campus, people_amount=people_amount, booking_date=booking_date,
+                              booking_hour=booking_hour, observations=observations, active=True, approved=False)
+            booking.save()
+            occupancy.registrar_ocupacion(campus.campus_id, booking_date, booking_slot, people_amount)
+            # Los correos se envían desde la bandeja de salida, fuera de la petición
+            outbox.encolar_correos_reserva(booking.booking_id, person, campus, booking_date, booking_hour, people_amount, observations, 'confirmada')
+            events.notificar(campus.campus_id, booking_date, 'booking', booking_id=booking.booking_id, change='created')
+            # Al final, para que el bloqueo de la fila de la sede dure lo menos posible
+            conditional.registrar_cambio(campus.campus_id)
+
+            body = {'success': True, 'message': 'Booking created successfully', 'data': self.serializer_class(booking).data}
+            if idempotency_key:
+                idempotency.guardar_respuesta(idempotency_key, 'create-booking', status.HTTP_201_CREATED, body)
+
+        return Response(body, status=status.HTTP_201_CREATED)
 
 
 class BookingList(generics.ListAPIView):
     queryset = Booking.objects.all()
     serializer_class = BookingListSerializer
+    default_page_size = 100
+    max_page_size = 500
+    state_filters = exports.FILTROS_ESTADO
+
+    def parse_params(self, data):
+        # Compartido con la versión async (bookings.async_views)
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        state = data.get('state')
+
+        try:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else datetime.now().date()
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+        except ValueError:
+            raise ValidationError('Invalid date format')
+
+        try:
+            page_size = min(int(data.get('page_size', self.default_page_size)), self.max_page_size)
+        except ValueError:
+            raise ValidationError('Invalid page size')
+        if page_size <= 0:
+            raise ValidationError('Invalid page size')
+
+        if state and state.upper() not in self.state_filters:
+            raise ValidationError('Invalid state')
+
+        return {'date_from': date_from, 'date_to': date_to, 'state': state, 'cursor': data.get('cursor'),
+                'page_size': page_size, 'today': not data.get('date_from')}
+
+    def get_etag(self, campus_id, params, data_version, data_modified):
+        # Sin date_from el listado empieza hoy, así que también cambia a medianoche
+        if params['today']:
+            midnight = timezone.make_aware(datetime.combine(params['date_from'], datetime.min.time()))
+            data_modified = max(data_modified, midnight) if data_modified else midnight
+
+        etag = conditional.calcular_etag('booking-list', campus_id, data_version, params['date_from'], params['date_to'],
+                                         params['state'], params['cursor'], params['page_size'])
+        return etag, data_modified
+
+    def get_page_queryset(self, campus_id, params):
+        bookings = Booking.objects.filter(campus_id=campus_id, booking_date__gte=params['date_from'])
+        if params['date_to']:
+            bookings = bookings.filter(booking_date__lte=params['date_to'])
+        if params['state']:
+            bookings = bookings.filter(self.state_filters[params['state'].upper()])
+        if params['cursor']:
+            try:
+                bookings = bookings.filter(pagination.filtro_despues_de(params['cursor']))
+            except ValueError:
+                raise ValidationError('Invalid cursor')
+
+        # Una consulta por página: la persona viene en el mismo JOIN
+        return (
+            bookings.select_related('person_id')
+            .order_by('booking_date', 'booking_slot', 'booking_hour', 'booking_id')[:params['page_size'] + 1]
+        )
+
+    def get_page_body(self, bookings, page_size):
+        next_cursor = pagination.codificar_cursor(bookings[page_size - 1]) if len(bookings) > page_size else None
+        serializer = self.serializer_class(bookings[:page_size], many=True)
+        return {'success': True, 'message': 'Booking List', 'data': serializer.data, 'next_cursor': next_cursor}
+
+    def get(self, request, campus_id):
+        params = self.parse_params(request.query_params)
 
-    def get(self, request, campus_id):  
+        if catalog.obtener_sede(campus_id) is None:
+            raise NotFound('Campus not found')
 
-        booking_date = datetime.now().strftime('%Y-%m-%d')
+        # La versión de datos cambia con cada reserva, por eso no sale del catálogo
         try:
-            campus = Campus.objects.get(campus_id=campus_id)
+            data_version, data_modified = Campus.objects.values_list('data_version', 'data_modified').get(campus_id=campus_id)
         except Campus.DoesNotExist:
             raise NotFound('Campus not found')
+
+        etag, data_modified = self.get_etag(campus_id, params, data_version, data_modified)
+        not_modified = conditional.respuesta_no_modificada(request, etag, data_modified)
+        if not_modified:
+            return not_modified
+
+        bookings = list(self.get_page_queryset(campus_id, params))
+        response = Response(self.get_page_body(bookings, params['page_size']), status=status.HTTP_200_OK)
+        return conditional.agregar_validadores(response, etag, data_modified)
         
-        campus = Campus.objects.get(campus_id=campus_id)
 
-        # bookings = Booking.objects.filter(campus_id=campus.campus_id, booking_date=booking_date).order_by('booking_hour')
+class BookingExport(generics.GenericAPIView):
 
-        bookings = Booking.objects.filter(campus_id=campus.campus_id, booking_date__gte=booking_date).order_by('booking_date', 'booking_hour')
+    def get(self, request, campus_id):
+        data = request.query_params
+        # 'format' lo reserva DRF para la negociación de contenido
+        export_format = data.get('export_format', 'csv').lower()
+        date_from = data.get('date_from')
+        date_to = data.get('date_to')
+        state = data.get('state')
+
+        if export_format not in exports.FORMATOS:
+            raise ValidationError('Invalid export format')
+
+        try:
+            date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+            date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+        except ValueError:
+            raise ValidationError('Invalid date format')
+
+        if state and state.upper() not in exports.FILTROS_ESTADO:
+            raise ValidationError('Invalid state')
+
+        if catalog.obtener_sede(campus_id) is None:
+            raise NotFound('Campus not found')
+
+        lineas, content_type = exports.FORMATOS[export_format]
+        rows = exports.filas_reservas(campus_id, date_from, date_to, state.upper() if state else None)
+        content = lineas(rows)
+        if isinstance(request._request, ASGIRequest):
+            content = exports.abloques(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bookings-{campus_id}.{export_format}"'
+        return response
 
-        serializer = self.serializer_class(bookings, many=True)
-        return Response({'success': True, 'message': 'Booking List', 'data': serializer.data}, status=status.HTTP_200_OK)
-        
 
 class BookingByIdView(generics.RetrieveAPIView):
     queryset = Booking.objects.all()
@@ -190,12 +395,11 @@ class BookingByIdView(generics.RetrieveAPIView):
         if not booking_id:
             raise ValidationError('Missing required fields')
         
-        if not Booking.objects.filter(booking_id=booking_id).exists():
+        booking = details.obtener_detalle_reserva(booking_id)
+        if booking is None:
             raise NotFound('Booking not found')
-        
-        booking = Booking.objects.get(booking_id=booking_id)
-        serializer = self.serializer_class(booking)
-        return Response({'success': True, 'message': 'Booking Detail', 'data': serializer.data}, status=status.HTTP_200_OK)
+
+        return Response({'success': True, 'message': 'Booking Detail', 'data': booking}, status=status.HTTP_200_OK)
 
 
 class BookingActivasByPersonView(generics.ListAPIView):
@@ -206,9 +410,8 @@ class BookingActivasByPersonView(generics.ListAPIView):
         if not person_id:
             raise ValidationError('Missing required fields')
 
-        bookings = Booking.objects.filter(person_id=person_id, active=True)
-        serializer = self.serializer_class(bookings, many=True)
-        return Response({'success': True, 'message': 'Active Bookings List', 'data': serializer.data}, status=status.HTTP_200_OK)
+        bookings = details.listar_activas_de_persona(person_id)
+        return Response({'success': True, 'message': 'Active Bookings List', 'data': bookings}, status=status.HTTP_200_OK)
     
 
 class BookingUpdate(generics.UpdateAPIView):
@@ -223,31 +426,140 @@ class BookingUpdate(generics.UpdateAPIView):
         if not booking_id or not booking_status:
             raise ValidationError('Missing required fields')
         
-        try:
-            booking = Booking.objects.get(booking_id=booking_id)
-        except Booking.DoesNotExist:
-            raise NotFound('Booking not found')
-        
-        if booking_status == 'approved':
-            booking.approved = True
+        with transaction.atomic():
+            try:
+                booking = Booking.objects.select_for_update().get(booking_id=booking_id)
+            except Booking.DoesNotExist:
+                raise NotFound('Booking not found')
+
+            if booking_status not in ('approved', 'cancelled'):
+                raise ValidationError('Invalid status')
+
+            # Solo una reserva activa ocupa capacidad en su franja
+            if booking.active:
+                occupancy.registrar_ocupacion(booking.campus_id_id, booking.booking_date, booking.booking_slot, -booking.people_amount)
+
+            if booking_status == 'approved':
+                booking.approved = True
             booking.active = False
             booking.save()
+            details.invalidar_reserva(booking.booking_id)
+            events.notificar(booking.campus_id_id, booking.booking_date, 'booking', booking_id=booking.booking_id, change=booking_status)
+
+            if booking_status == 'cancelled':
+                outbox.encolar_correos_reserva(booking.booking_id, booking.person_id, catalog.obtener_sede(booking.campus_id_id), booking.booking_date, booking.booking_hour, booking.people_amount, booking.observations, 'cancelada')
+
+            conditional.registrar_cambio(booking.campus_id_id)
+
+        if booking_status == 'approved':
             return Response({'success': True, 'message': 'Booking approved successfully'}, status=status.HTTP_200_OK)
-        
-        if booking_status == 'cancelled':
-            person = People.objects.get(person_id=booking.person_id.person_id)
-            campus = Campus.objects.get(campus_id=booking.campus_id.campus_id)
-            observaciones = booking.observations if booking.observations != "" else 'Sin observaciones'
-            booking.active = False
-            booking.save()
 
+        return Response({'success': True, 'message': 'Booking cancelled successfully'}, status=status.HTTP_200_OK)
+
+
+class BookingBulkUpdate(generics.GenericAPIView):
+    queryset = Booking.objects.all()
+
+    def post(self, request):
+        data = request.data
+        booking_ids = data.get('booking_ids')
+        booking_status = data.get('status')
+
+        if not booking_ids or not booking_status:
+            raise ValidationError('Missing required fields')
+
+        if booking_status not in ('approved', 'cancelled'):
+            raise ValidationError('Invalid status')
+
+        if not isinstance(booking_ids, list):
+            raise ValidationError('booking_ids must be a list')
+
+        try:
+            booking_ids = list(dict.fromkeys(int(booking_id) for booking_id in booking_ids))
+        except (TypeError, ValueError):
+            raise ValidationError('booking_ids must contain integers')
+
+        if len(booking_ids) > settings.BOOKING_BULK_UPDATE_MAX:
+            raise ValidationError(f'At most {settings.BOOKING_BULK_UPDATE_MAX} bookings per request')
+
+        with transaction.atomic():
+            # Bloquear en orden de ID para no cruzarse con otra petición masiva
+            bookings = {
+                booking.booking_id: booking
+                for booking in Booking.objects.select_for_update(of=('self',)).select_related('person_id').filter(booking_id__in=booking_ids).order_by('booking_id')
+            }
+            # Solo se aprueban o cancelan reservas activas; las ya gestionadas se informan sin tocarlas
+            activas = [booking for booking in bookings.values() if booking.active]
+
+            if activas:
+                cambios = {'active': False}
+                if booking_status == 'approved':
+                    cambios['approved'] = True
+                # Bloquear el cupo y las franjas en el mismo orden que create-booking/
+                # y la importación (sede, fecha, franja), así no se bloquean en cruz
+                for campus_id, booking_date in sorted({(booking.campus_id_id, booking.booking_date) for booking in activas}):
+                    occupancy.bloquear_capacidad(campus_id, booking_date)
+
+                Booking.objects.filter(booking_id__in=[booking.booking_id for booking in activas]).update(**cambios)
+
+                # Liberar la capacidad una vez por franja
+                liberadas = {}
+                for booking in activas:
+                    franja = (booking.campus_id_id, booking.booking_date, booking.booking_slot)
+                    liberadas[franja] = liberadas.get(franja, 0) + booking.people_amount
+                for (campus_id, booking_date, booking_slot), people_amount in sorted(liberadas.items()):
+                    occupancy.registrar_ocupacion(campus_id, booking_date, booking_slot, -people_amount)
+
+                for booking in activas:
+                    details.invalidar_reserva(booking.booking_id)
+                    events.notificar(booking.campus_id_id, booking.booking_date, 'booking', booking_id=booking.booking_id, change=booking_status)
+
+                if booking_status == 'cancelled':
+                    outbox.encolar_correos_reservas(activas, 'cancelada')
+
+                for campus_id in sorted({booking.campus_id_id for booking in activas}):
+                    conditional.registrar_cambio(campus_id)
+
+        results = []
+        for booking_id in booking_ids:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                result = 'not_found'
+            elif booking.active:
+                result = booking_status
+            else:
+                result = 'not_active'
+            results.append({'booking_id': booking_id, 'result': result})
+
+        updated = sum(1 for result in results if result['result'] == booking_status)
+        return Response({'success': True, 'message': f'{updated} bookings {booking_status}', 'data': results}, status=status.HTTP_200_OK)
+
+
+class BookingImport(generics.GenericAPIView):
+    queryset = Booking.objects.all()
+
+    def post(self, request):
+        # Un archivo CSV o JSON en 'file', o las filas como lista JSON en el cuerpo
+        upload = request.FILES.get('file')
+        if upload is not None:
+            import_format = request.data.get('import_format') or upload.name.rsplit('.', 1)[-1].lower()
+            if import_format not in imports.FORMATOS:
+                raise ValidationError('Invalid import format')
             try:
-                utils.enviar_correo_confirmacion_reserva(person.email, f'{person.first_name} {person.first_last_name}', booking.booking_date, booking.booking_hour, campus.name, booking.people_amount, observaciones, 'cancelada')
-                utils.enviar_correo_confirmacion_reserva_sede(campus.email, campus.name, f'{person.first_name} {person.first_last_name}', booking.booking_date, booking.booking_hour, booking.people_amount, person.phone_number, observaciones, 'cancelada')
-        
-            except Exception as e:
-                return Response({'success': False, 'message': f'Error sending email: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                rows = imports.leer_filas(upload.read(), import_format)
+            except (ValueError, UnicodeDecodeError):
+                raise ValidationError('Invalid file content')
+        else:
+            rows = request.data
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise ValidationError('Expected a list of bookings or a file')
+
+        if not rows:
+            raise ValidationError('No data provided')
 
-            return Response({'success': True, 'message': 'Booking cancelled successfully'}, status=status.HTTP_200_OK)
+        if len(rows) > settings.BOOKING_IMPORT_MAX_ROWS:
+            raise ValidationError(f'At most {settings.BOOKING_IMPORT_MAX_ROWS} rows per import')
 
-        raise ValidationError('Invalid status')
\ No newline at end of file
+        report = imports.importar_reservas(rows)
+        accepted = sum(1 for row in report if row['result'] == 'accepted')
+        return Response({'success': True, 'message': f'{accepted} of {len(report)} bookings imported', 'data': report}, status=status.HTTP_200_OK)
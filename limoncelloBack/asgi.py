@@ -3,6 +3,10 @@ ASGI config for limoncelloBack project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The availability event stream (stream-availability/) needs this entry point
+(under WSGI it answers 501 instead of holding a worker per client):
+    gunicorn limoncelloBack.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -50,7 +50,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'limoncelloBack.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise sin bloquear las vistas async bajo ASGI
 ]
 
 ROOT_URLCONF = 'limoncelloBack.urls'
@@ -72,6 +72,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'limoncelloBack.wsgi.application'
+ASGI_APPLICATION = 'limoncelloBack.asgi.application'  # Necesaria para el stream de eventos
 
 
 # Database
@@ -128,6 +129,48 @@ EMAIL_USE_SSL = os.getenv('EMAIL_USE_SSL', 'False') == 'True'
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'False') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '30'))  # Segundos
+EMAIL_CONNECTION_MAX_AGE = int(os.getenv('EMAIL_CONNECTION_MAX_AGE', '60'))  # Segundos que un hilo reutiliza su conexión SMTP
+
+
+# Cache de disponibilidad por sede y fecha (en memoria de cada proceso)
+AVAILABILITY_CACHE_TTL = int(os.getenv('AVAILABILITY_CACHE_TTL', '60'))  # Segundos
+AVAILABILITY_CACHE_MAX_ENTRIES = int(os.getenv('AVAILABILITY_CACHE_MAX_ENTRIES', '512'))
+
+# Cache del detalle de cada reserva (en memoria de cada proceso). Solo el
+# proceso que aprueba o cancela la reserva la invalida: los demás workers
+# pueden mostrar el estado anterior hasta BOOKING_CACHE_TTL, por eso es corto
+BOOKING_CACHE_TTL = int(os.getenv('BOOKING_CACHE_TTL', '5'))  # Segundos
+BOOKING_CACHE_MAX_ENTRIES = int(os.getenv('BOOKING_CACHE_MAX_ENTRIES', '1024'))
+
+# Segundos que un proceso conserva los horarios compilados de las sedes
+SCHEDULE_CACHE_MAX_AGE = int(os.getenv('SCHEDULE_CACHE_MAX_AGE', '300'))
+
+# Segundos que un proceso conserva el catálogo de sedes
+CAMPUS_CATALOG_MAX_AGE = int(os.getenv('CAMPUS_CATALOG_MAX_AGE', '300'))
+
+# Bandeja de salida de correos (la procesa el comando process_email_outbox)
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', '50'))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '6'))
+EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv('EMAIL_OUTBOX_RETRY_SECONDS', '30'))  # Espera base; se duplica en cada intento
+
+# Recordatorios de reserva (los envía el comando send_booking_reminders)
+BOOKING_REMINDER_HOURS_BEFORE = int(os.getenv('BOOKING_REMINDER_HOURS_BEFORE', '24'))
+BOOKING_REMINDER_BATCH_SIZE = int(os.getenv('BOOKING_REMINDER_BATCH_SIZE', '100'))
+
+# Máximo de reservas por petición de aprobación o cancelación masiva
+BOOKING_BULK_UPDATE_MAX = int(os.getenv('BOOKING_BULK_UPDATE_MAX', '500'))
+
+# Máximo de filas por importación de reservas desde import-bookings/
+BOOKING_IMPORT_MAX_ROWS = int(os.getenv('BOOKING_IMPORT_MAX_ROWS', '2000'))
+
+# Tiempo que se guarda la respuesta de una petición con Idempotency-Key
+# (las vencidas las borra el comando purge_idempotency_keys)
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', '86400'))  # Segundos
+
+# Stream de eventos de disponibilidad (Server-Sent Events, solo bajo ASGI)
+SSE_QUEUE_SIZE = int(os.getenv('SSE_QUEUE_SIZE', '100'))  # Eventos sin leer antes de descartar al cliente
+SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
 
 
 # Internationalization
@@ -172,6 +215,16 @@ CORS_ALLOW_HEADERS = [
     "content-type",
     "authorization",
     "x-csrftoken",
+    "if-none-match",
+    "if-modified-since",
+    "idempotency-key",
+]
+
+# Validadores de caché que el frontend puede leer en las respuestas
+CORS_EXPOSE_HEADERS = [
+    "etag",
+    "last-modified",
+    "idempotent-replayed",
 ]
 
 CORS_ALLOW_METHODS = [
@@ -3,7 +3,7 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, NotFound, PermissionDenied
 from users.models import People, Users
-from bookings.models import Campus
+import bookings.catalog as catalog
 from users.serializers import PeopleSerializer, UsersSerializer
 from security.models import Roles
 from security.serializers import RolesSerializer, UserRolesSerializer
@@ -46,9 +46,7 @@ class RolesListByCampus(generics.ListAPIView):
 
     def get(self, request, campus_id):
 
-        try:
-            campus = Campus.objects.get(campus_id=campus_id)
-        except Campus.DoesNotExist:
+        if catalog.obtener_sede(campus_id) is None:
             raise NotFound({'success': False, 'message': 'Campus not found'})
         
         roles = Roles.objects.filter(campus_id=campus_id)
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['email'], name='people_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(fields=['identification'], name='people_identification_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='users',
+            index=models.Index(fields=['username'], name='users_username_idx'),
+        ),
+    ]
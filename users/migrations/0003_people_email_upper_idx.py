@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-18 14:47
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_people_users_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='people',
+            name='people_email_idx',
+        ),
+        migrations.AddIndex(
+            model_name='people',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='people_email_upper_idx'),
+        ),
+    ]
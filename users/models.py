@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 
 # Create your models here.
 class People(models.Model):
@@ -23,6 +24,11 @@ class People(models.Model):
         verbose_name = 'Person'
         verbose_name_plural = 'People'
         unique_together = ('identification', 'email')
+        indexes = [
+            # Búsqueda de la persona de una reserva por correo sin distinguir mayúsculas
+            models.Index(Upper('email'), name='people_email_upper_idx'),
+            models.Index(fields=['identification'], name='people_identification_idx'),
+        ]
 
 
 class Users(models.Model):
@@ -41,4 +47,7 @@ class Users(models.Model):
     class Meta:
         db_table = 'Users'
         verbose_name = 'User'
-        verbose_name_plural = 'Users'
\ No newline at end of file
+        verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['username'], name='users_username_idx'),
+        ]
\ No newline at end of file